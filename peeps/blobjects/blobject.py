@@ -4,7 +4,7 @@ import numpy as np
 import operator
 from collections import deque
 from constants import C, ORIGIN, CustomError, D, EASE_IN_OUT, PI, WHITE,\
-    OBJECT_COUNTER, BLACK
+    OBJECT_COUNTER, BLACK, DEG_TO_RAD
 from externals.blender_utils import selectOnly, computeQuaternion
 from externals.bezier_interpolation import interpolate, getInterpolatedColors
 from externals.iterable_utils import mag
@@ -164,7 +164,7 @@ class Blobject(object):
                 "Calling rotate() requires a reasonable rotation axis to be passed in as a tuple"
             )
         if angleDeg:
-            angle = angle * PI / 180
+            angle = angle * DEG_TO_RAD
         # change axis to be normalized
         axis = tuple([i/mag(axis) for i in axis])
         # determine quaternion
@@ -618,7 +618,7 @@ class Blobject(object):
         Returns:
             str: string representation of ID. Example: 34 becomes ".00000034"
         """
-        return "." + str(i).zfill(8)
+        return ".%08d" % i
 
     def getOppositeColor(self):
         """
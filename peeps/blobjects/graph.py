@@ -4,7 +4,7 @@ import mathutils as mut
 import numpy as np
 from collections import deque
 from constants import Z, CustomError, D, C, X, Y, ORIGIN, TAU, PI, EASE_IN_OUT,\
-    WHITE, BLACK, OCEAN, FRAME_RATE
+    WHITE, BLACK, OCEAN, FRAME_RATE, DEG_TO_RAD
 from blobjects.blobject import Blobject
 from blobjects.shapes import Ball, Curve, Cylinder, Vector
 from blobjects.text import Tex
@@ -349,7 +349,7 @@ class Graph2D(Blobject):
                 "Calling rotate() requires a reasonable rotation axis to be passed in as a tuple"
             )
         if angleDeg:
-            angle = angle * PI / 180
+            angle = angle * DEG_TO_RAD
         # determine quaternion
         q = mut.Quaternion(axis, angle)
         # check for indeterminacy of q
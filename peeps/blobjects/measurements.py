@@ -6,7 +6,7 @@ from constants import C, ORIGIN, Y, PI, Z, D, BLACK, EASE_IN_OUT, X, CustomError
 from blobjects.blobject import Blobject
 from blobjects.shapes import Ball, Cylinder, Line
 from externals.bezier_interpolation import interpolate
-from externals.blender_utils import selectOnly
+from externals.blender_utils import selectOnly, viewOverride
 
 class Angle(Blobject):
     def __init__(self, centerDist=1, v1=(10, 0, 0), v2=(0, 10, 0), thickness=0.02):
@@ -53,17 +53,7 @@ class Angle(Blobject):
         currObj.name = self.name[0]
         # curve arc by adding loopcuts and a simple-deform bend
         # override context for loopcut
-        win = C.window
-        scr = win.screen
-        areas3d = [area for area in scr.areas if area.type == "VIEW_3D"]
-        region = [region for region in areas3d[0].regions if region.type == "WINDOW"]
-        override = {
-            "window": win,
-            "screen": scr,
-            "area": areas3d[0],
-            "region": region[0],
-            "scene": C.scene,
-        }
+        override = viewOverride()
         # perform loopcut
         bpy.ops.object.mode_set(mode="EDIT")
         bpy.ops.mesh.loopcut_slide(
@@ -3,19 +3,21 @@ import bmesh
 import mathutils as mut
 import numpy as np
 import os
-import operator
-import sys
 from collections import deque
-from statistics import mode, mean
+from math import cos, hypot, sin, sqrt
 from constants import ORIGIN, CustomError, PI, C, EASE_IN_OUT, BLACK, TAU, D,\
-    ELEM_CHARGE, MASS_PROTON, WHITE, FRAME_RATE, LINEAR, SVG_SCALING, SVG_DIR
+    ELEM_CHARGE, MASS_PROTON, WHITE, FRAME_RATE, LINEAR, SVG_SCALING, SVG_DIR,\
+    DEG_TO_RAD
 from blobjects.blobject import Blobject
 from blobjects.text import Tex
 from externals.bezier_interpolation import interpolate
-from externals.blender_utils import selectOnly, computeQuaternion, delete
-from externals.iterable_utils import difference, subtraction, mag, addition,\
-    flattenOnce
-from externals.miscellaneous import computeAbsoluteNodes
+from externals.blender_utils import selectOnly, computeQuaternion,\
+    viewOverride, importSVG
+from externals.iterable_utils import difference, modeOrMean
+from externals.miscellaneous import computeAbsoluteNodes, resamplePath
+
+# rounded unit direction -> (w, x, y, z) quaternion that turns the z-axis onto it
+_QUATERNION_CACHE = {}
 
 class NodeWires(Blobject):
     def __init__(
@@ -84,26 +86,25 @@ class NodeWires(Blobject):
             currCounter += 1
         self.curveCoords.append(prevStack)
         self.curves = []
+        self.name = []
         for i, coords in enumerate(self.curveCoords):
-            curr = coords[0]
+            nodeArray = np.asarray(coords, dtype=np.float64)
             modCoords = []
-            for j, node in enumerate(coords):
+            for j, node in enumerate(nodeArray):
                 # determine the direction by taking into account the next node and previous node
                 if j == 0:
-                    prevNode = subtraction(
-                        coords[j], subtraction(coords[j + 1], coords[j])
-                    )
+                    prevNode = 2 * node - nodeArray[j + 1]
                 else:
-                    prevNode = coords[j - 1]
-                try:
-                    nextNode = coords[j + 1]
-                except IndexError:
-                    nextNode = subtraction(
-                        coords[j], subtraction(coords[j - 1], coords[j])
-                    )
-                prevDirection = mut.Vector(subtraction(node, prevNode)).normalized()
-                nextDirection = mut.Vector(subtraction(nextNode, node)).normalized()
-                alpha = np.arccos(np.clip(prevDirection.dot(nextDirection), -1, 1))
+                    prevNode = nodeArray[j - 1]
+                if j == len(nodeArray) - 1:
+                    nextNode = 2 * node - nodeArray[j - 1]
+                else:
+                    nextNode = nodeArray[j + 1]
+                prevDirection = node - prevNode
+                prevDirection = prevDirection / (np.linalg.norm(prevDirection) or 1)
+                nextDirection = nextNode - node
+                nextDirection = nextDirection / (np.linalg.norm(nextDirection) or 1)
+                alpha = np.arccos(np.clip(np.dot(prevDirection, nextDirection), -1, 1))
                 if alpha == PI:
                     # just break, idk what else to do
                     raise CustomError(
@@ -114,29 +115,32 @@ class NodeWires(Blobject):
                     r = curvatureRadius
                     s = r * np.tan(alpha / 2)
                     # move backwards a distance s
-                    curr = addition(node, -s * prevDirection)
+                    curr = node - s * prevDirection
                     # determine the correct direction to go in
-                    rotAxis = prevDirection.cross(nextDirection)
-                    correctDirection = -prevDirection.cross(rotAxis)
-                    # prevSpot = curr
-                    circleOrigin = addition(curr, r * correctDirection)
+                    rotAxis = np.cross(prevDirection, nextDirection)
+                    correctDirection = -np.cross(prevDirection, rotAxis)
+                    circleOrigin = curr + r * correctDirection
                     # circleOrigin is now the origin of the curvature circle
                     # determine the angle between circleOrigin and the previous spot
                     pointer1 = -correctDirection
-                    # we want to rotate pointer1 through an angle dalpha on each pointStep
-                    dalpha = np.diff(interpolate(0, alpha, LINEAR, resolution))[0]
-                    modCoords.append(addition(circleOrigin, tuple(r * pointer1)))
-                    quat = mut.Quaternion(rotAxis, dalpha)
-                    for _ in range(resolution):
-                        pointer1 = quat @ pointer1
-                        modCoords.append(addition(circleOrigin, tuple(r * pointer1)))
+                    # rotate pointer1 through an angle dalpha on each pointStep - since
+                    # pointer1 is perpendicular to rotAxis, every step at once is just
+                    # pointer1 * cos + (unitAxis x pointer1) * sin
+                    dalpha = alpha / resolution
+                    angs = dalpha * np.arange(resolution + 1)
+                    unitAxis = rotAxis / np.linalg.norm(rotAxis)
+                    pointers = np.outer(np.cos(angs), pointer1) + np.outer(
+                        np.sin(angs), np.cross(unitAxis, pointer1)
+                    )
+                    modCoords.extend(map(tuple, (circleOrigin + r * pointers).tolist()))
                 else:
-                    modCoords.append(addition(node, tuple(-0.001 * prevDirection)))
-                    modCoords.append(node)
-                    modCoords.append(addition(node, tuple(0.001 * nextDirection)))
-            self.curves.append(Curve(modCoords, color, thickness))
+                    modCoords.append(tuple((node - 0.001 * prevDirection).tolist()))
+                    modCoords.append(coords[j])
+                    modCoords.append(tuple((node + 0.001 * nextDirection).tolist()))
+            curve = Curve(modCoords, color, thickness)
+            self.curves.append(curve)
+            self.name.extend(curve.name)
             self.curveCoords[i] = modCoords
-        self.name = flattenOnce([curve.name for curve in self.curves])
 
 class Ball(Blobject):
     def __init__(self, radius=1, origin=ORIGIN, mass=-1):
@@ -193,34 +197,16 @@ class Ball(Blobject):
         # error checking
         if radius <= 0:
             raise CustomError("radius must be a non-zero positive value")
-        t = interpolate(t0, tf, rate)
-        t.pop(0)
+        # reverse the times up front, since the stack is popped from the end
+        elapsed = np.asarray(interpolate(t0, tf, rate)[:0:-1]) - t0
         # create a default linear scaling
         (x0, y0, z0) = self.origin
         (x1, y1, z1) = origin
-        v1 = (radius - self.radius) / (tf - t0)
-        v4 = (x1 - x0) / (tf - t0)
-        v5 = (y1 - y0) / (tf - t0)
-        v6 = (z1 - z0) / (tf - t0)
-        og = [self.radius, x0, y0, z0]
-        # define linear shifts
-        def lam1(t):
-            return og[0] + (t - t0) * v1
-
-        def lam4(t):
-            return og[1] + (t - t0) * v4
-
-        def lam5(t):
-            return og[2] + (t - t0) * v5
-
-        def lam6(t):
-            return og[3] + (t - t0) * v6
-
-        stack = deque()
-        t.reverse()
-        for tj in t:
-            stack.append((lam1(tj), (lam4(tj), lam5(tj), lam6(tj))))
-        return stack
+        r = self.radius + elapsed * ((radius - self.radius) / (tf - t0))
+        x = x0 + elapsed * ((x1 - x0) / (tf - t0))
+        y = y0 + elapsed * ((y1 - y0) / (tf - t0))
+        z = z0 + elapsed * ((z1 - z0) / (tf - t0))
+        return deque(zip(r.tolist(), zip(x.tolist(), y.tolist(), z.tolist())))
     def update_change(self, val, radius=1, origin=ORIGIN):
         self.change(*val)
 
@@ -475,17 +461,7 @@ class CurvyArrow(Blobject):
         currObj.name = self.name[0]
         # curve arrow by adding loopcuts and a simple-deform bend
         # override context for loopcut
-        win = C.window
-        scr = win.screen
-        areas3d = [area for area in scr.areas if area.type == "VIEW_3D"]
-        region = [region for region in areas3d[0].regions if region.type == "WINDOW"]
-        override = {
-            "window": win,
-            "screen": scr,
-            "area": areas3d[0],
-            "region": region[0],
-            "scene": C.scene,
-        }
+        override = viewOverride()
         # perform loopcut
         bpy.ops.object.mode_set(mode="EDIT")
         bpy.ops.mesh.loopcut_slide(
@@ -542,12 +518,10 @@ class CurvyArrow(Blobject):
             normal = self.normal
         # correct twistDeg
         if twistDeg:
-            twist *= PI / 180
-        # retrieve the vector
-        strI = self.stringID(self.id)
-        # select only the relevant vector
-        selectOnly(["curvy_arrow" + strI])
-        obj = D.objects["curvy_arrow" + strI]
+            twist *= DEG_TO_RAD
+        # select only the relevant vector - its name already holds the id suffix
+        selectOnly(self.name)
+        obj = D.objects[self.name[0]]
         # define new vector
         ogAxis = mut.Vector(self.normal)
         newAxis = mut.Vector(normal)
@@ -584,14 +558,11 @@ class CurvyArrow(Blobject):
             raise CustomError(
                 "Calling init_transform() requires a non-zero rotation axis to be passed in as normal"
             )
-        t = interpolate(t0, tf, rate)
-        t.pop(0)
-        diffs = np.diff(interpolate(0, twist, rate, numIntervals=len(t))).tolist()
-        stack = deque()
-        diffs.reverse()
-        for smallAngle in diffs:
-            stack.append(smallAngle)
-        return stack
+        # one twist step per frame (same count as interpolate(t0, tf) minus its
+        # first point) - no need to run the time axis through the bezier itself
+        numFrames = int((tf - t0) * FRAME_RATE + 1) - 1
+        diffs = np.diff(interpolate(0, twist, rate, numIntervals=numFrames))
+        return deque(diffs[::-1].tolist())
     def update_transform(self, val, normal=ORIGIN, twist=0, twistDeg=False):
         # error checking
         if normal == ORIGIN:
@@ -604,6 +575,45 @@ class CurvyArrow(Blobject):
             )
         self.transform(normal, val, twistDeg)
 
+def _unitMesh(kind="cylinder", vertices=100):
+    """
+    Returns a smooth-shaded cylinder or cone mesh of radius 1 and height 1, centered
+    at the origin, creating it on first use. Shapes copy their geometry from these
+    instead of running a primitive operator every time.
+
+    Args:
+        kind (str, optional): either "cylinder" or "cone". Defaults to "cylinder".
+        vertices (int, optional): number of vertices around the base. Defaults
+            to 100.
+
+    Returns:
+        bpy.types.Mesh: the unit mesh.
+    """
+    meshName = "peeps_unit_%s_%d" % (kind, vertices)
+    unitMesh = D.meshes.get(meshName)
+    if unitMesh is None:
+        # build straight into a new mesh datablock - a primitive operator would add
+        # an object, change the selection and add into any mesh left in Edit Mode
+        bm = bmesh.new()
+        # create_cone's diameters are really radii
+        bmesh.ops.create_cone(
+            bm,
+            cap_ends=True,
+            segments=vertices,
+            diameter1=1,
+            diameter2=0 if kind == "cone" else 1,
+            depth=1,
+        )
+        for face in bm.faces:
+            face.smooth = True
+        unitMesh = D.meshes.new(meshName)
+        bm.to_mesh(unitMesh)
+        bm.free()
+        # keep the mesh around even while no object uses it
+        unitMesh.use_fake_user = True
+    return unitMesh
+
+
 class Cylinder(Blobject):
     def __init__(self, radius=1, height=1, origin=ORIGIN):
         """Generates a cylinder with some radius and height centered at some origin.
@@ -628,14 +638,21 @@ class Cylinder(Blobject):
         self.origin = origin
         # construct unique ID
         self.id = self.createID("cylinder")
-        bpy.ops.mesh.primitive_cylinder_add(
-            vertices=100, radius=self.radius, depth=self.height, location=self.origin
-        )
-        bpy.ops.object.shade_smooth()
         # determine name suffix for cyllinder
         strI = self.stringID(self.id)
         self.name = ["cylinder" + strI]
-        C.view_layer.objects.active.name = self.name[0]
+        # copy the shared unit cylinder and stretch it to size - each Cylinder needs
+        # its own mesh, since coloring assigns materials to the mesh data
+        cylMesh = _unitMesh("cylinder", 100).copy()
+        cylMesh.name = self.name[0]
+        cylMesh.transform(
+            mut.Matrix.Diagonal((self.radius, self.radius, self.height, 1))
+        )
+        cylObj = D.objects.new(self.name[0], cylMesh)
+        cylObj.location = self.origin
+        C.collection.objects.link(cylObj)
+        selectOnly(self.name)
+        C.view_layer.objects.active = cylObj
 
 class Ellipse(Curve):
     def __init__(
@@ -804,29 +821,80 @@ class Helix(NodeWires):
             endLength (float, optional): length of Helix ends. Defaults to 3.
         """
         # create nodes
-        nodes = []
         x = lambda t: radius * np.cos(t)
         y = lambda t: radius * np.sin(t)
         z = lambda t: pitch / TAU * t - length / 2
-        # points split into 0.01 segments
-        t = 0
-        while z(t) < length / 2:
-            nodes.append((x(t), y(t), z(t)))
-            t += 0.1
+        # points split into 0.1 segments, all the way up until z reaches length / 2
+        numPoints = int(np.ceil(length * TAU / (pitch * 0.1))) + 1
+        t = 0.1 * np.arange(numPoints)
+        t = t[z(t) < length / 2]
+        nodes = list(map(tuple, np.column_stack((x(t), y(t), z(t))).tolist()))
+        # the first t past the last node
+        tEnd = t[-1] + 0.1 if len(t) > 0 else 0
         if ends:
-            nodes.insert(0, (0, 0, z(0)))
-            nodes.insert(0, (0, 0, z(0) - endLength))
-            nodes.append((0, 0, z(t)))
-            nodes.append((0, 0, z(t) + endLength))
+            nodes = (
+                [(0, 0, z(0) - endLength), (0, 0, z(0))]
+                + nodes
+                + [(0, 0, z(tEnd)), (0, 0, z(tEnd) + endLength)]
+            )
         self.nodes = nodes
         self.radius = radius
         self.pitch = pitch
         self.length = length
         self.thickness = thickness
-        self.realLength = length / pitch * np.sqrt(pitch ** 2 + (TAU * radius) ** 2)
+        self.realLength = length / pitch * hypot(pitch, TAU * radius)
         super().__init__(nodes, thickness, color, 0.1, 10)
         self.shift(*origin)
 
+def _tubeMesh(radiusIn, radiusOut, height, segments=100):
+    """
+    Returns the geometry of a tube along the z-axis, centered at the origin. A
+    radiusIn of 0 closes the tube into a solid cylinder with flat caps.
+
+    Args:
+        radiusIn (float): inner radius of the tube, or 0 for a solid cylinder.
+        radiusOut (float): outer radius of the tube.
+        height (float): height of the tube.
+        segments (int, optional): number of vertices around each ring. Defaults
+            to 100.
+
+    Returns:
+        tuple: vertices as an (n, 3) array and faces as a list of vertex index
+            lists, ready for Mesh.from_pydata().
+    """
+    angs = TAU * np.arange(segments) / segments
+    ring = np.column_stack((np.cos(angs), np.sin(angs)))
+    # vertex rings are outer bottom, outer top, then inner bottom, inner top
+    radii = (radiusOut, radiusIn) if radiusIn else (radiusOut,)
+    verts = np.concatenate(
+        [
+            np.column_stack((r * ring, np.full(segments, h)))
+            for r in radii
+            for h in (-height / 2, height / 2)
+        ]
+    )
+    ob = np.arange(segments)
+    ot = ob + segments
+    k = (ob + 1) % segments
+    # outer wall
+    faces = np.column_stack((ob, ob[k], ot[k], ot)).tolist()
+    if not radiusIn:
+        # bottom and top caps
+        return verts, faces + [ob[::-1].tolist(), ot.tolist()]
+    ib = ob + 2 * segments
+    it = ob + 3 * segments
+    faces += np.concatenate(
+        (
+            # inner wall, facing the axis
+            np.column_stack((ib, it, it[k], ib[k])),
+            # top rim
+            np.column_stack((ot, ot[k], it[k], it)),
+            # bottom rim
+            np.column_stack((ob, ib, ib[k], ob[k])),
+        )
+    ).tolist()
+    return verts, faces
+
 class HollowCylinder(Blobject):
     def __init__(self, radius=1, height=1, origin=ORIGIN, thickness=0.1):
         """Just what you'd expect: a Cylinder, but hollow.
@@ -854,14 +922,21 @@ class HollowCylinder(Blobject):
         self.height = height
         self.origin = origin
         self.thickness = thickness
-        cuttingCylinder = Cylinder(radius - thickness, height + 0.1, origin)
-        mainCylinder = Cylinder(radius, height, origin)
-        # use cuttingCylinder to cut mainCylinder
-        bpy.ops.object.modifier_add(type="BOOLEAN")
-        C.object.modifiers["Boolean"].object = D.objects[cuttingCylinder.name[0]]
-        bpy.ops.object.modifier_apply(apply_as="DATA", modifier="Boolean")
-        delete(cuttingCylinder)
-        self.name = mainCylinder.name
+        # construct unique ID
+        self.id = self.createID("cylinder")
+        strI = self.stringID(self.id)
+        self.name = ["cylinder" + strI]
+        # build the tube directly instead of boolean-cutting one cylinder with another
+        verts, faces = _tubeMesh(radius - thickness, radius, height)
+        tubeMesh = D.meshes.new(self.name[0])
+        tubeMesh.from_pydata(verts.tolist(), [], faces)
+        tubeMesh.polygons.foreach_set("use_smooth", [True] * len(tubeMesh.polygons))
+        tubeMesh.update()
+        tubeObj = D.objects.new(self.name[0], tubeMesh)
+        tubeObj.location = self.origin
+        C.collection.objects.link(tubeObj)
+        selectOnly(self.name)
+        C.view_layer.objects.active = tubeObj
 
 class Line(Blobject):
     def __init__(self, p1=ORIGIN, p2=ORIGIN, width=0.02, numSegments=1):
@@ -925,8 +1000,9 @@ class Line(Blobject):
                     currObj = C.active_object
                     self.name.append("line" + strI + ".seg." + str(portion))
                     currObj.name = self.name[-1]
-                    # place origin at world-origin
-                    bpy.ops.object.origin_set(type="ORIGIN_CURSOR", center="MEDIAN")
+            # place the origin of every segment at world-origin in one go
+            selectOnly(self.name)
+            bpy.ops.object.origin_set(type="ORIGIN_CURSOR", center="MEDIAN")
             self.shift(*p1)
             self.transform(tuple(p3))
             self.color(BLACK)
@@ -981,13 +1057,11 @@ class PointCharge(Blobject):
             # shift the tex up
             self.label.shift(0, 0, radius + self.differential)
             self.label.color(BLACK)
-            self.name = [self.ball.name, self.label.name]
+            self.name = self.ball.name + self.label.name
         else:
             self.label = False
-            self.name = [self.ball.name]
+            self.name = list(self.ball.name)
         self.relativePosition = (0, 0, radius + self.differential)
-        # reduce
-        self.name = [item for sublist in self.name for item in sublist]
         self.shift(origin[0], origin[1], origin[2])
 
     def color(self, theColor=WHITE, ignoreTampered=False):
@@ -1021,31 +1095,23 @@ class PointCharge(Blobject):
                 Rarely needed, but the option exists. Defaults to None.
         """
         super().shift(x, y, z, xLam, yLam, zLam)
-        if self.label:
-            self.label.origin = tuple(map(operator.add, self.label.origin, (x, y, z)))
-            self.label.cameraTrack()
+        label = self.label
+        if label:
+            lo = label.origin
+            label.origin = (lo[0] + x, lo[1] + y, lo[2] + z)
+            # cameraTrack sets an absolute rotation, so it only needs to run before
+            # the shifts below when it still has to move the curve origins
+            if not label.twistable:
+                label.cameraTrack()
             # change placement of label, based off of its relative position
-            self.label.shift(
-                -self.relativePosition[0],
-                -self.relativePosition[1],
-                -self.relativePosition[2],
-            )
-            loc = C.scene.camera.location
-            o = self.origin
-            connection = (loc[0] - o[0], loc[1] - o[1], loc[2] - o[2])
-            mag = np.sqrt(connection[0] ** 2 + connection[1] ** 2 + connection[2] ** 2)
+            label.shift(*(-r for r in self.relativePosition))
+            # point the label from the ball's center towards the camera
+            conn = np.subtract(C.scene.camera.location, self.origin)
             newDist = self.radius + self.differential
-            self.label.shift(
-                connection[0] * newDist / mag,
-                connection[1] * newDist / mag,
-                connection[2] * newDist / mag,
-            )
-            self.relativePosition = (
-                connection[0] * newDist / mag,
-                connection[1] * newDist / mag,
-                connection[2] * newDist / mag,
-            )
-            self.label.cameraTrack()
+            rel = (conn * (newDist / np.linalg.norm(conn))).tolist()
+            label.shift(*rel)
+            self.relativePosition = tuple(rel)
+            label.cameraTrack()
 
     def shiftByPath(self, nodes=[]):
         """
@@ -1057,54 +1123,16 @@ class PointCharge(Blobject):
                 to shift to. Defaults to [].
         """
         # just move to the last node if not rendering
-        self.shift(*subtraction(nodes[-1], self.origin))
+        n = nodes[-1]
+        o = self.origin
+        self.shift(n[0] - o[0], n[1] - o[1], n[2] - o[2])
     def init_shiftByPath(self, t0=0, tf=4, rate=LINEAR, nodes=[]):
-        # first, determine the total distance of the path
-        totalDistance = 0
-        curr = self.origin
-        for node in nodes:
-            dist = subtraction(node, curr)
-            totalDistance += mag(dist)
-            curr = node
         # find the total number of frames
-        totalFrames = (tf - t0) * FRAME_RATE
-        distancePerFrame = totalDistance / totalFrames
-        # now move distancePerFrame in the direction of each node, watching if you overshoot
         t = interpolate(t0, tf, LINEAR)
         t.pop(0)
-        stack = deque()
-        curr = self.origin
-        prev = curr
-        for i, node in zip(range(len(nodes)), nodes):
-            # check if already at node
-            if curr == node:
-                continue
-            # determine the direction
-            correctDirection = mut.Vector(subtraction(node, curr)).normalized()
-            currentDirection = mut.Vector(subtraction(node, curr)).normalized()
-            while currentDirection.dot(correctDirection) > 0:
-                distToMove = list(currentDirection * distancePerFrame)
-                stack.append(distToMove)
-                prev = curr
-                curr = tuple(addition(curr, distToMove))
-                currentDirection = mut.Vector(subtraction(node, curr)).normalized()
-            # we've moved too far - revert
-            stack.pop()
-            curr = prev
-            # what distance do we have left to traverse?
-            distanceLeft = mag(subtraction(node, curr))
-            # go to node and take that distance away from the first step for the next node
-            curr = node
-            try:
-                nextNode = nodes[i + 1]
-            except IndexError:
-                break
-            currentDirection = mut.Vector(subtraction(nextNode, curr)).normalized()
-            distToMove = list(currentDirection * (distancePerFrame - distanceLeft))
-            curr = tuple(addition(curr, distToMove))
-            stack.append(list(subtraction(curr, prev)))
-        stack.reverse()
-        return stack
+        # walk the path at an equal distance per frame
+        deltas = resamplePath(self.origin, nodes, len(t))
+        return deque(deltas[::-1].tolist())
     def update_shiftByPath(self, val, nodes=[]):
         self.shift(*val)
 
@@ -1145,42 +1173,17 @@ class Ramp(Blobject):
         # alter mesh to create ramp by merging vertices
         # get the active mesh
         rampMesh = C.object.data
-        # get bmesh representation, by first creating empty bmesh
-        bm = bmesh.new()
-        # fill in bmesh
-        bm.from_mesh(rampMesh)
-        # modify vertices
-        for v in bm.verts:
-            if v.co.x == 1 and v.co.z == 1:
-                v.co.z = -1
-        # write bmesh back to active mesh
-        bm.to_mesh(rampMesh)
-        # delete bmesh
-        bm.free()
-        bpy.ops.transform.resize(
-            value=(self.length / 2, 1, 1),
-            orient_type="LOCAL",
-            orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)),
-            orient_matrix_type="LOCAL",
-            constraint_axis=(True, False, False),
-            mirror=True,
-        )
-        bpy.ops.transform.resize(
-            value=(1, self.depth / 2, 1),
-            orient_type="LOCAL",
-            orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)),
-            orient_matrix_type="LOCAL",
-            constraint_axis=(False, True, False),
-            mirror=True,
-        )
-        bpy.ops.transform.resize(
-            value=(1, 1, self.height / 2),
-            orient_type="LOCAL",
-            orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)),
-            orient_matrix_type="LOCAL",
-            constraint_axis=(False, False, True),
-            mirror=True,
-        )
+        # read the vertex coordinates straight out of the mesh
+        co = np.empty(len(rampMesh.vertices) * 3, dtype=np.float32)
+        rampMesh.vertices.foreach_get("co", co)
+        co = co.reshape(-1, 3)
+        # drop the top vertices on the +x side down to the bottom
+        co[(co[:, 0] == 1) & (co[:, 2] == 1), 2] = -1
+        rampMesh.vertices.foreach_set("co", co.ravel())
+        rampMesh.update()
+        # the cube has size 2, so halve each dimension - the local scales along each
+        # axis are independent, so set them all at once
+        C.object.scale = (self.length / 2, self.depth / 2, self.height / 2)
 
 class RelativeNodeWires(NodeWires):
     def __init__(
@@ -1221,13 +1224,20 @@ class RelativeNodeWires(NodeWires):
         )
 
 class Ring(Blobject):
-    def __init__(self, radius=1, thickness=1, origin=ORIGIN):
+    def __init__(
+        self, radius=1, thickness=1, origin=ORIGIN, majorSegments=48, minorSegments=24
+    ):
         """Creates a simple ring or torus.
 
         Args:
             radius (float, optional): radius of ring outline. Defaults to 1.
             thickness (float, optional): thickness of Ring. Defaults to 1.
             origin (tuple, optional): centered origin of Ring. Defaults to ORIGIN.
+            majorSegments (int, optional): number of segments around the ring
+                outline. Defaults to 48.
+            minorSegments (int, optional): number of segments around the ring's
+                cross-section. Smooth shading hides the facets at most sizes, so only
+                raise these for rings that take up a lot of the screen. Defaults to 24.
 
         Raises:
             CustomError: thickness must be greater than 0
@@ -1242,14 +1252,16 @@ class Ring(Blobject):
         self.radius = radius
         self.thickness = thickness
         self.origin = origin
+        self.majorSegments = majorSegments
+        self.minorSegments = minorSegments
         # construct unique ID
         self.id = self.createID("ring")
         bpy.ops.mesh.primitive_torus_add(
             align="WORLD",
             location=self.origin,
             rotation=(0, 0, 0),
-            major_segments=100,
-            minor_segments=100,
+            major_segments=self.majorSegments,
+            minor_segments=self.minorSegments,
             major_radius=self.radius,
             minor_radius=self.thickness,
             abso_major_rad=1.25,
@@ -1273,7 +1285,9 @@ class Ring(Blobject):
         leColor = self.getColor()
         isTransparent = self.isTransparent
         self.delete()
-        self.__init__(radius, self.thickness, origin)
+        self.__init__(
+            radius, self.thickness, origin, self.majorSegments, self.minorSegments
+        )
         self.color(leColor)
         if isTransparent:
             self.transparent(self.currentAlpha)
@@ -1281,34 +1295,16 @@ class Ring(Blobject):
         # error checking
         if radius <= 0:
             raise CustomError("radius must be a non-zero positive value")
-        t = interpolate(t0, tf, rate)
-        t.pop(0)
+        # reverse the times up front, since the stack is popped from the end
+        elapsed = np.asarray(interpolate(t0, tf, rate)[:0:-1]) - t0
         # create a default linear scaling
         (x0, y0, z0) = self.origin
         (x1, y1, z1) = origin
-        v1 = (radius - self.radius) / (tf - t0)
-        v4 = (x1 - x0) / (tf - t0)
-        v5 = (y1 - y0) / (tf - t0)
-        v6 = (z1 - z0) / (tf - t0)
-        og = [self.radius, x0, y0, z0]
-        # define linear shifts
-        def lam1(t):
-            return og[0] + (t - t0) * v1
-
-        def lam4(t):
-            return og[1] + (t - t0) * v4
-
-        def lam5(t):
-            return og[2] + (t - t0) * v5
-
-        def lam6(t):
-            return og[3] + (t - t0) * v6
-
-        stack = deque()
-        t.reverse()
-        for tj in t:
-            stack.append((lam1(tj), (lam4(tj), lam5(tj), lam6(tj))))
-        return stack
+        r = self.radius + elapsed * ((radius - self.radius) / (tf - t0))
+        x = x0 + elapsed * ((x1 - x0) / (tf - t0))
+        y = y0 + elapsed * ((y1 - y0) / (tf - t0))
+        z = z0 + elapsed * ((z1 - z0) / (tf - t0))
+        return deque(zip(r.tolist(), zip(x.tolist(), y.tolist(), z.tolist())))
     def update_change(self, val, radius=1, origin=ORIGIN):
         self.change(*val)
 
@@ -1333,8 +1329,6 @@ class SVG(Blobject):
         self.expression = expression
         # deselect everything
         selectOnly([])
-        # get objects before import
-        names_pre_import = set([o.name for o in C.scene.objects])
         # import svg
         scalerValue = False
         try:
@@ -1342,15 +1336,8 @@ class SVG(Blobject):
         except:
             if not scalerValue:
                 raise CustomError("scaling doesn't exist in SVG_SCALING")
-        bpy.ops.import_curve.svg(
-            filepath=os.path.join(SVG_DIR, "_" + expression + ".svg")
-        )
-        # get objects after import
-        names_post_import = set([o.name for o in C.scene.objects])
-        # differential objects are newly added objects
-        new_object_names = names_post_import.difference(names_pre_import)
-        self.name = [name for name in new_object_names]
-        for name in new_object_names:
+        self.name = importSVG(os.path.join(SVG_DIR, "_" + expression + ".svg"))
+        for name in self.name:
             o = C.scene.objects[name]
             o.select_set(True)
             C.view_layer.objects.active = o
@@ -1362,33 +1349,25 @@ class SVG(Blobject):
         )
         bpy.ops.object.origin_set(type="ORIGIN_GEOMETRY", center="BOUNDS")
         # shift the entire expression into the center
-        # first, grab the minimum and maximum location numbers
-        minLoc = sys.maxsize
-        maxLoc = -sys.maxsize
-        self.xLocs = []
-        self.yLocs = []
-        for leName in new_object_names:
-            xLoc = D.objects[leName].location[0]
-            self.xLocs.append(D.objects[leName].location[0])
-            self.yLocs.append(D.objects[leName].location[1])
-            if xLoc > maxLoc:
-                maxLoc = xLoc
-            if xLoc < minLoc:
-                minLoc = xLoc
+        # first, grab the (x, y) location of every curve in one pass
+        locs = np.array(
+            [D.objects[leName].location[:2] for leName in self.name], dtype=np.float64
+        ).reshape(-1, 2)
+        self.xLocs = locs[:, 0].tolist()
+        self.yLocs = locs[:, 1].tolist()
+        minLoc = locs[:, 0].min()
+        maxLoc = locs[:, 0].max()
         # sort the names of the objects based on location
         self.xSortedNames = [
-            x for _, x in sorted(zip(self.xLocs, self.name), key=lambda pair: pair[0])
+            self.name[i] for i in np.argsort(locs[:, 0], kind="stable")
         ]
         self.ySortedNames = [
-            x for _, x in sorted(zip(self.yLocs, self.name), key=lambda pair: pair[0])
+            self.name[i] for i in np.argsort(locs[:, 1], kind="stable")
         ]
         # shift by the average x-location value and move to the mode y-location value
-        try:
-            self.shift(-(maxLoc + minLoc) / 2, -mode(self.yLocs))
-        except:
-            self.shift(-(maxLoc + minLoc) / 2, -mean(self.yLocs))
+        self.shift(-(maxLoc + minLoc) / 2, -modeOrMean(self.yLocs))
         # now set the origin of each curve in the Tex object to the origin
-        for name in new_object_names:
+        for name in self.name:
             o = C.scene.objects[name]
             o.select_set(True)
             C.view_layer.objects.active = o
@@ -1409,15 +1388,10 @@ class SVG(Blobject):
         self.__init__(self.expression, scaler, self.origin)
         self.color(leColor)
     def init_rescale(self, t0=0, tf=1, rate=EASE_IN_OUT, scaler=1):
-        t = interpolate(t0, tf, rate)
-        t.pop(0)
-        v = (scaler - self.scale) / (tf - t0)
-        x = lambda t: self.scale + (t - t0) * v
-        stack = deque()
-        t.reverse()
-        for tj in t:
-            stack.append(x(tj))
-        return stack
+        # reverse the times up front, since the stack is popped from the end
+        elapsed = np.asarray(interpolate(t0, tf, rate)[:0:-1]) - t0
+        scales = self.scale + elapsed * ((scaler - self.scale) / (tf - t0))
+        return deque(scales.tolist())
     def update_rescale(self, val, scaler=1):
         self.rescale(val)
 
@@ -1431,25 +1405,68 @@ class Triangle(Blobject):
             p3 (tuple, optional): The third point. Defaults to (0, 1, 0).
         """
         super().__init__()
-        # error checking
-        b1 = Line(p1, p2)
-        b2 = Line(p2, p3)
-        selectOnly([b1.name[0], b2.name[0]])
-        C.view_layer.objects.active = D.objects[b1.name[0]]
-        bpy.ops.object.join()
-        b3 = Line(p3, p1)
-        selectOnly([b1.name[0], b3.name[0]])
-        C.view_layer.objects.active = D.objects[b1.name[0]]
-        bpy.ops.object.join()
-        currObj = C.active_object
+        # build each edge as a Line-like cylinder, but write all three straight into
+        # a single mesh instead of creating and joining three Line objects
+        width = 0.02
+        points = np.array([p1, p2, p3], dtype=np.float64)
+        verts = []
+        faces = []
+        for i in range(3):
+            start = points[i]
+            axis = points[(i + 1) % 3] - start
+            length = np.linalg.norm(axis)
+            # error checking
+            if length == 0:
+                raise CustomError("Triangle() has a zero-length side - crashing...")
+            axis /= length
+            # any vector not parallel to the axis spans the cylinder's cross-section
+            helper = (1, 0, 0) if abs(axis[0]) < 0.9 else (0, 1, 0)
+            u = np.cross(axis, helper)
+            u /= np.linalg.norm(u)
+            w = np.cross(axis, u)
+            edgeVerts, edgeFaces = _tubeMesh(0, width, length)
+            # turn the upright cylinder onto the edge and stand it on the start point
+            edgeVerts = start + (length / 2) * axis + edgeVerts @ np.array((u, w, axis))
+            base = len(verts)
+            verts.extend(edgeVerts.tolist())
+            faces.extend([[base + v for v in face] for face in edgeFaces])
         self.id = self.createID("triangle")
         strI = self.stringID(self.id)
         self.name = ["triangle" + strI]
-        currObj.name = self.name[0]
-        v1 = mut.Vector((p2[0] - p1[0], p2[1] - p1[1], p2[2] - p1[2]))
-        v2 = mut.Vector((p3[0] - p1[0], p3[1] - p1[1], p3[2] - p3[2]))
-        v3 = v1.cross(v2)
-        self.normal = (v3[0], v3[1], v3[2])
+        triMesh = D.meshes.new(self.name[0])
+        triMesh.from_pydata(verts, [], faces)
+        triMesh.polygons.foreach_set("use_smooth", [True] * len(triMesh.polygons))
+        triMesh.update()
+        triObj = D.objects.new(self.name[0], triMesh)
+        C.collection.objects.link(triObj)
+        selectOnly(self.name)
+        C.view_layer.objects.active = triObj
+        self.color(BLACK)
+        normal = np.cross(points[1] - points[0], points[2] - points[0])
+        self.normal = tuple(normal.tolist())
+
+def _rotateByQuaternion(q, v):
+    """
+    Rotates a vector by a unit quaternion with the expanded form of q v q*:
+    t = 2 (q.xyz x v), v' = v + q.w t + q.xyz x t.
+
+    Args:
+        q (iterable): unit quaternion as (w, x, y, z).
+        v (iterable): 3-component vector to rotate.
+
+    Returns:
+        tuple: the rotated vector.
+    """
+    w, qx, qy, qz = q
+    vx, vy, vz = v
+    tx = 2 * (qy * vz - qz * vy)
+    ty = 2 * (qz * vx - qx * vz)
+    tz = 2 * (qx * vy - qy * vx)
+    return (
+        vx + w * tx + qy * tz - qz * ty,
+        vy + w * ty + qz * tx - qx * tz,
+        vz + w * tz + qx * ty - qy * tx,
+    )
 
 class Vector(Blobject):
     def __init__(
@@ -1486,65 +1503,90 @@ class Vector(Blobject):
         self.id = self.createID("vector")
         # determine name suffix (which number vector is this?)
         strI = self.stringID(self.id)
-        # generate name list of components
-        self.name = ["vector_body" + strI, "vector_head" + strI]
+        self.name = ["vector" + strI]
+        # create the object with a blank mesh, then shape and orient it
+        obj = D.objects.new(self.name[0], D.meshes.new(self.name[0]))
+        C.collection.objects.link(obj)
+        obj.rotation_mode = "QUATERNION"
+        self._reshape(xProj, yProj, zProj)
+        # place the new object at its origin directly - shift() would scan every
+        # object in the scene to select this one, which adds up when building fields
+        # of many vectors
+        obj.location = origin
+        self.origin = tuple(origin)
+        self.color(color)
+
+    def _reshape(self, xProj=1, yProj=0, zProj=0):
+        """
+        Rewrites the Vector's mesh and orientation in place to match new components,
+        keeping its object, name, location and materials.
+
+        Args:
+            xProj (float, optional): the x-component of the Vector. Defaults to 1.
+            yProj (float, optional): the y-component of the Vector. Defaults to 0.
+            zProj (float, optional): the z-component of the Vector. Defaults to 0.
+        """
+        obj = D.objects[self.name[0]]
         # prepare to create vector along z-axis, since cylinder and cone are upright
-        vec = mut.Vector((xProj, yProj, zProj))
-        mag = vec.length
+        mag = sqrt(xProj * xProj + yProj * yProj + zProj * zProj)
         # error-checking for magnitude stuff
+        coneRadius = self.coneRadius
+        coneHeight = self.coneHeight
+        thickness = self.thickness
         if coneRadius == None:
             coneRadius = mag / 2 if mag <= 1 else 0.5
         if coneHeight == None:
             coneHeight = mag / 2 if mag <= 1 else 0.5
         if thickness == None:
             thickness = coneHeight / 5
-        # create vector body
-        bpy.ops.mesh.primitive_cylinder_add(radius=thickness, depth=mag - coneHeight)
-        obj = C.active_object
-        bpy.ops.object.shade_smooth()
-        obj.name = self.name[0]
-        C.scene.cursor.location[2] = -(mag - coneHeight) / 2
-        bpy.ops.object.origin_set(type="ORIGIN_CURSOR", center="MEDIAN")
-        bpy.ops.transform.translate(
-            value=(0, 0, (mag - coneHeight) / 2), constraint_axis=(False, False, True)
+        # build vector body and head from the shared unit meshes - the primitive
+        # operators default to 32 vertices
+        bodyHeight = mag - coneHeight
+        bm = bmesh.new()
+        bm.from_mesh(_unitMesh("cylinder", 32))
+        # scale the body and move it up so that its base sits on the object origin
+        bmesh.ops.transform(
+            bm,
+            matrix=mut.Matrix.Translation((0, 0, bodyHeight / 2))
+            @ mut.Matrix.Diagonal((thickness, thickness, bodyHeight, 1)),
+            verts=bm.verts[:],
         )
-        C.scene.cursor.location[2] = mag - coneHeight / 2
-        # create vector head
-        bpy.ops.mesh.primitive_cone_add(radius1=coneRadius, radius2=0, depth=coneHeight)
-        obj = C.active_object
-        bpy.ops.object.shade_smooth()
-        obj.name = self.name[1]
-        C.scene.cursor.location[2] = 0
-        # join vector_head and vector_body
-        # first, select the vector parts
-        selectOnly(self.name)
-        C.view_layer.objects.active = D.objects[self.name[0]]
-        # now, join them
-        bpy.ops.object.join()
-        obj = C.active_object
-        # change name
-        self.name = ["vector" + strI]
-        obj.name = self.name[0]
-        # shift vector to its origin before constructing proper orientation
-        self.shift(origin[0], origin[1], origin[2])
+        numBodyVerts = len(bm.verts)
+        bm.from_mesh(_unitMesh("cone", 32))
+        bm.verts.ensure_lookup_table()
+        bmesh.ops.transform(
+            bm,
+            matrix=mut.Matrix.Translation((0, 0, mag - coneHeight / 2))
+            @ mut.Matrix.Diagonal((coneRadius, coneRadius, coneHeight, 1)),
+            verts=bm.verts[numBodyVerts:],
+        )
+        # overwriting the geometry keeps the mesh's material slots
+        bm.to_mesh(obj.data)
+        bm.free()
+        obj.data.update()
         # define new vector
         zAxis = mut.Vector((0, 0, 1))
         # quaternion rotation
-        if np.isclose(vec[0], 0) and np.isclose(vec[1], 0) and vec[2] < 0:
-            # indeterminate quaternion means it points in the negative z-axis
-            bpy.ops.transform.rotate(
-                value=PI,
-                orient_axis="Y",
-                orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)),
-                constraint_axis=(False, True, False),
-                mirror=True,
-            )
+        # same tolerance as np.isclose(x, 0), without going through NumPy
+        if abs(xProj) <= 1e-8 and abs(yProj) <= 1e-8 and zProj < 0:
+            # indeterminate quaternion means it points in the negative z-axis, so
+            # just flip it half a turn about the y-axis
+            obj.rotation_quaternion = (0, 0, 1, 0)
+        elif mag == 0:
+            # let computeQuaternion raise its indeterminacy error
+            obj.rotation_quaternion = computeQuaternion(zAxis, mut.Vector((0, 0, 0)))
         else:
-            obj.rotation_mode = "QUATERNION"
-            obj.rotation_quaternion = computeQuaternion(zAxis, vec)
+            # directions tend to repeat over an animation, so reuse their quaternions
+            key = (round(xProj / mag, 9), round(yProj / mag, 9), round(zProj / mag, 9))
+            quat = _QUATERNION_CACHE.get(key)
+            if quat is None:
+                if len(_QUATERNION_CACHE) >= 1024:
+                    _QUATERNION_CACHE.clear()
+                quat = tuple(computeQuaternion(zAxis, mut.Vector(key)))
+                _QUATERNION_CACHE[key] = quat
+            obj.rotation_quaternion = quat
         # reset x, y, z magnitudes
         self.normal = (xProj, yProj, zProj)
-        self.color(color)
 
     def copy(self):
         """Deep copy constructor - returns a reference to the copied Vector
@@ -1578,42 +1620,24 @@ class Vector(Blobject):
             zLam (lambda, optional): z-lambda that defines transformation as a
             function of time. Defaults to None.
         """
-        self.delete()
-        self.__init__(
-            x2,
-            y2,
-            z2,
-            self.origin,
-            self.objColor,
-            self.thickness,
-            self.coneRadius,
-            self.coneHeight,
-        )
+        # reshape the existing object instead of deleting and rebuilding it
+        self._reshape(x2, y2, z2)
+        # the new mesh is built around the object origin with its tail there, so put
+        # the object back at the Vector's origin - changeOriginTo() may have moved it
+        # to some other pivot, which a rebuilt Vector never kept either
+        D.objects[self.name[0]].location = self.origin
     def init_transform(
         self, t0=0, tf=1, rate=EASE_IN_OUT, x2=1, y2=0, z2=0, x=None, y=None, z=None
     ):
-        t = interpolate(t0, tf, rate)
-        t.pop(0)
+        # reverse the times up front, since the stack is popped from the end
+        t = np.asarray(interpolate(t0, tf, rate)[:0:-1])
         # if no lambdas specified, create a default linear scaling between normals
-        ogAxis = mut.Vector(self.normal)
-        newAxis = mut.Vector((x2, y2, z2))
-        v = (newAxis - ogAxis) / (tf - t0)
         if x == None or y == None or z == None:
-
-            def x(t):
-                return ogAxis[0] + (t - t0) * v[0]
-
-            def y(t):
-                return ogAxis[1] + (t - t0) * v[1]
-
-            def z(t):
-                return ogAxis[2] + (t - t0) * v[2]
-
-        stack = deque()
-        t.reverse()
-        for tj in t:
-            stack.append((x(tj), y(tj), z(tj)))
-        return stack
+            ogAxis = np.array(self.normal, dtype=np.float64)
+            v = (np.array((x2, y2, z2), dtype=np.float64) - ogAxis) / (tf - t0)
+            axes = ogAxis + np.outer(t - t0, v)
+            return deque(map(tuple, axes.tolist()))
+        return deque((x(tj), y(tj), z(tj)) for tj in t.tolist())
     def update_transform(self, val, x2=1, y2=0, z2=0, x=None, y=None, z=None):
         if val is None:
             raise CustomError(
@@ -1640,22 +1664,23 @@ class Vector(Blobject):
                 quaternion issues - if needed, just do two 90 degree flips.
         """
         # error checking
-        if axis == ORIGIN:
+        if not (axis[0] or axis[1] or axis[2]):
             raise CustomError(
                 "Calling rotate() requires a reasonable rotation axis to be passed in as a tuple"
             )
         if angleDeg:
-            angle = angle * PI / 180
-        # first, determine the new vector via quaternion
-        q = mut.Quaternion(axis, angle)
-        if q.magnitude == 0:
+            angle = angle * DEG_TO_RAD
+        # first, determine the new vector via the unit quaternion about the
+        # normalized axis
+        n = sqrt(axis[0] * axis[0] + axis[1] * axis[1] + axis[2] * axis[2])
+        if n == 0:
             raise CustomError(
                 "Indeterminate Quaternion Rotation: make use of another rotation to interpolate between antiparallel states"
             )
-        q.normalize()
-        newVec = q @ (mut.Vector(self.normal))
+        s = sin(angle / 2) / n
+        q = (cos(angle / 2), axis[0] * s, axis[1] * s, axis[2] * s)
         # now, just transform it
-        self.transform(newVec[0], newVec[1], newVec[2])
+        self.transform(*_rotateByQuaternion(q, self.normal))
 
     # need this functionality for situations like rotating after calling changeOriginTo()
     def superRotate(self, axis=(0, 0, 1), angle=0, angleDeg=False):
@@ -1678,7 +1703,7 @@ class Vector(Blobject):
         return super().init_rotate(t0, tf, rate, axis, angle, angleDeg)
     def update_superRotate(self, val, axis=(0, 0, 1), angle=0, angleDeg=False):
         # error checking
-        if axis == ORIGIN:
+        if not (axis[0] or axis[1] or axis[2]):
             raise CustomError(
                 "Calling rotate() requires a new non-zero direction tuple to be passed in as newNormal"
             )
@@ -1,17 +1,38 @@
+import asyncio
+import atexit
 import bpy
+import json
 import mathutils as mut
+import numpy as np
 import os
-import sys
-from collections import deque
-from hashlib import sha256
-from statistics import mean, mode
+import shutil
+import subprocess
+import tempfile
+from collections import defaultdict, deque
+from functools import lru_cache
+from hashlib import blake2b, sha256
 from constants import ORIGIN, C, SVG_DIR, D, BLACK, CustomError, EASE_IN_OUT,\
     FRAME_RATE, WHITE, Y, PI, RED, ORANGE, YELLOW, GREEN, BLUE, PURPLE,\
     TEMPLATE_TEX_FILE_BODY
 from blobjects.blobject import Blobject
 from externals.bezier_interpolation import interpolate
-from externals.blender_utils import selectOnly, computeQuaternion
-from externals.iterable_utils import addition
+from externals.blender_utils import selectOnly, computeQuaternion, importSVG,\
+    selectionOverride
+from externals.iterable_utils import modeOrMean
+
+# rendered SVG files for this session, keyed by tex_hash(expression)
+_TEX_SVG_CACHE = {}
+# persistent record of rendered SVG filenames (relative to SVG_DIR) across sessions
+_SVG_MANIFEST_FILE = os.path.join(SVG_DIR, "manifest.json")
+_SVG_MANIFEST = {}
+_manifestDirty = False
+# path (without extension) of the precompiled preamble format, once it's been built
+_texFormat = None
+# LaTeX's intermediate .tex, .aux, .log and .dvi files go here instead of SVG_DIR,
+# in RAM where /dev/shm is available; only the finished SVGs land in SVG_DIR
+_TEX_SCRATCH_DIR = tempfile.mkdtemp(
+    prefix="peeps-", dir="/dev/shm" if os.path.isdir("/dev/shm") else None
+)
 
 class Tex(Blobject):
     def __init__(
@@ -59,19 +80,13 @@ class Tex(Blobject):
         self.morphPaths = []
         # deselect everything
         selectOnly([])
-        svgFile = tex_to_svg_file(expression)
-        # get objects before import
-        names_pre_import = set([o.name for o in C.scene.objects])
-        # import svg
-        bpy.ops.import_curve.svg(filepath=os.path.join(SVG_DIR, svgFile))
-        # get objects after import
-        names_post_import = set([o.name for o in C.scene.objects])
-        # differential objects are newly added objects
-        new_object_names = names_post_import.difference(names_pre_import)
-        self.name = [name for name in new_object_names]
+        svgFile = tex_to_svg_file(expression, self.hash)
+        # import svg - repeats of an expression copy the curves of the first import
+        new_object_names = importSVG(os.path.join(SVG_DIR, svgFile))
+        self.name = list(new_object_names)
         self.tampered = [False] * len(self.name)
-        for name in new_object_names:
-            o = C.scene.objects[name]
+        new_objects = [D.objects[name] for name in new_object_names]
+        for o in new_objects:
             o.select_set(True)
             C.view_layer.objects.active = o
         bpy.ops.transform.resize(
@@ -82,61 +97,33 @@ class Tex(Blobject):
         bpy.ops.object.origin_set(type="ORIGIN_GEOMETRY", center="BOUNDS")
         # shift the entire expression into the center
         # first, grab the minimum and maximum location numbers
-        minXLoc = sys.maxsize
-        maxXLoc = -sys.maxsize
-        minYLoc = sys.maxsize
-        maxYLoc = -sys.maxsize
-        self.xLocs = []
-        self.yLocs = []
-        for leName in new_object_names:
-            xLoc = D.objects[leName].location[0]
-            self.xLocs.append(xLoc)
-            yLoc = D.objects[leName].location[1]
-            self.yLocs.append(yLoc)
-            if xLoc > maxXLoc:
-                maxXLoc = xLoc
-            if xLoc < minXLoc:
-                minXLoc = xLoc
-            if yLoc > maxYLoc:
-                maxYLoc = yLoc
-            if yLoc < minYLoc:
-                minYLoc = yLoc
+        locs = np.array(
+            [o.location[:2] for o in new_objects], dtype=np.float64
+        ).reshape(-1, 2)
+        self.xLocs = locs[:, 0].tolist()
+        self.yLocs = locs[:, 1].tolist()
+        minXLoc, minYLoc = locs.min(axis=0).tolist()
+        maxXLoc, maxYLoc = locs.max(axis=0).tolist()
         self.minX = minXLoc
         self.minY = minYLoc
         self.maxX = maxXLoc
         self.maxY = maxYLoc
         # sort the names of the objects based on location
         self.xSortedNames = [
-            x for _, x in sorted(zip(self.xLocs, self.name), key=lambda pair: pair[0])
+            self.name[i] for i in np.argsort(locs[:, 0], kind="stable")
         ]
         self.ySortedNames = [
-            x for _, x in sorted(zip(self.yLocs, self.name), key=lambda pair: pair[0])
+            self.name[i] for i in np.argsort(locs[:, 1], kind="stable")
         ]
-        # shift by the average x-location value
-        if xShift:
-            self.shift(xShift)
-            self.xShift = xShift
-        else:
-            self.shift(-(maxXLoc + minXLoc) / 2)
-            self.xShift = -(maxXLoc + minXLoc) / 2
-        # move to the mode y-location value
-        if yShift:
-            self.shift(0, yShift)
-            self.yShift = yShift
-        else:
-            try:
-                self.shift(0, -mode(self.yLocs))
-                self.yShift = -mode(self.yLocs)
-            except:
-                self.shift(0, -mean(self.yLocs))
-                self.yShift = -mean(self.yLocs)
+        # shift by the average x-location value and move to the mode y-location value
+        self.xShift = xShift if xShift else -(maxXLoc + minXLoc) / 2
+        self.yShift = yShift if yShift else -modeOrMean(self.yLocs)
+        self.shift(self.xShift, self.yShift)
         # now set the origin of each curve in the Tex object to the origin
         if twistable:
-            for name in new_object_names:
-                o = C.scene.objects[name]
-                o.select_set(True)
-                C.view_layer.objects.active = o
-            bpy.ops.object.origin_set(type="ORIGIN_CURSOR")
+            bpy.ops.object.origin_set(
+                selectionOverride(new_object_names), type="ORIGIN_CURSOR"
+            )
         self.twistable = twistable
         self.scale = scale
         self.origin = ORIGIN
@@ -154,57 +141,58 @@ class Tex(Blobject):
         """
         # force the tex to be twistable in order to cameraTrack
         if not self.twistable:
-            for name in self.name:
-                o = C.scene.objects[name]
-                o.select_set(True)
-                C.view_layer.objects.active = o
-            bpy.ops.object.origin_set(type="ORIGIN_CURSOR")
+            bpy.ops.object.origin_set(
+                selectionOverride(self.name), type="ORIGIN_CURSOR"
+            )
             self.twistable = True
+        # twist label, so it's facing camera by its position - every curve gets the
+        # same rotation, so compute it once
+        loc = C.scene.camera.location
+        o = self.origin
+        connection = (loc[0] - o[0], loc[1] - o[1], loc[2] - o[2])
+        quat = C.scene.camera.rotation_quaternion
+        camNormal = quat @ mut.Vector((0, 0, 1))
+        newQuat = computeQuaternion(camNormal, mut.Vector(connection)) @ quat
         for name in self.name:
             obj = D.objects[name]
             obj.rotation_mode = "QUATERNION"
-            # obj.rotation_quaternion = C.scene.camera.rotation_quaternion
-            # twist label, so it's facing camera by its position
-            loc = C.scene.camera.location
-            o = self.origin
-            connection = (loc[0] - o[0], loc[1] - o[1], loc[2] - o[2])
-            quat = C.scene.camera.rotation_quaternion
-            camNormal = quat @ mut.Vector((0, 0, 1))
-            newQuat = computeQuaternion(camNormal, mut.Vector(connection))
-            obj.rotation_quaternion = newQuat @ quat
+            obj.rotation_quaternion = newQuat
     def init_cameraTrack(self, t0=0, tf=1, rate=EASE_IN_OUT):
         # never had an init_ and update_ not actually need a stack...
         # implementing a dummy stack as a poor man's fix for now
-        t = interpolate(t0, tf, rate)
-        t.pop(0)
-        stack = deque()
-        for _ in t:
-            stack.append(0)
-        return stack
+        return deque([0] * (len(interpolate(t0, tf, rate)) - 1))
     def update_cameraTrack(self, val):
         self.cameraTrack()
 
     def rescale(self, scaler=1):
         """
-        Rescales the Tex. NOTE: only works for Tex not oriented in fancy directions.
+        Rescales the Tex about its origin. The existing curves are scaled in place,
+        so their colors and orientations are kept.
 
         Args:
             scaler (float, optional): new scale of Tex object. Defaults to 1.
         """
-        leColor = self.getColor()
-        self.delete()
-        self.__init__(self.expression, scaler, self.twistable, self.origin)
-        self.color(leColor)
+        factor = scaler / self.scale
+        o = mut.Vector(self.origin)
+        for name in self.name:
+            obj = D.objects[name]
+            obj.location = o + (obj.location - o) * factor
+            obj.scale = obj.scale * factor
+        self.scale = scaler
+        # everything measured at import scales along with the curves
+        self.minX *= factor
+        self.maxX *= factor
+        self.minY *= factor
+        self.maxY *= factor
+        self.xShift *= factor
+        self.yShift *= factor
+        self.xLocs = [xLoc * factor for xLoc in self.xLocs]
+        self.yLocs = [yLoc * factor for yLoc in self.yLocs]
     def init_rescale(self, t0=0, tf=1, rate=EASE_IN_OUT, scaler=1):
-        t = interpolate(t0, tf, rate)
-        t.pop(0)
+        # reverse the times up front, since the stack is popped from the end
+        elapsed = np.asarray(interpolate(t0, tf, rate)[:0:-1]) - t0
         v = (scaler - self.scale) / (tf - t0)
-        x = lambda t: self.scale + (t - t0) * v
-        stack = deque()
-        t.reverse()
-        for tj in t:
-            stack.append(x(tj))
-        return stack
+        return deque((self.scale + elapsed * v).tolist())
     def update_rescale(self, val, scaler=1):
         self.rescale(val)
 
@@ -217,13 +205,9 @@ class Tex(Blobject):
             name (str, optional): the name of the Tex to be shifted. Defaults to None.
             morphShift (list, optional): list that defines the shift. Defaults to None.
         """
-        selectOnly([name])
-        # shift the object
-        bpy.ops.transform.translate(
-            value=morphShift,
-            orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)),
-            mirror=True,
-        )
+        # shift the object - writing the location directly skips the selection scan
+        # and operator overhead of bpy.ops.transform.translate
+        D.objects[name].location += mut.Vector(morphShift)
     def morphFrom(
         self, f=None, texObj=None, halfRuntime=1, rate=EASE_IN_OUT, render=None
     ):
@@ -265,68 +249,67 @@ class Tex(Blobject):
             raise CustomError("Tex objects don't have the same scale")
         # check for similar curves
         self.morphPaths = []
+        # group the names in texObj.name by character type, so each one is only
+        # parsed once
+        oldNamesByKey = defaultdict(list)
+        for oldName in texObj.name:
+            oldNamesByKey[morphParser(oldName)].append(oldName)
         i = 0
         for name in self.name:
-            nameSet = []
-            # find a name in self.name which matches any name (set) in texObj.name
-            for oldName in texObj.name:
-                # check if names match
-                if morphParser(oldName) == morphParser(name):
-                    # add the old name into the nameset
-                    nameSet.append(oldName)
+            # the names in texObj.name which match this name
+            nameSet = oldNamesByKey.get(morphParser(name), [])
             # now, choose the closest curve in nameSet to this curve
             if len(nameSet) == 0:
                 self.morphPaths.append([0, 0, 0])
             else:
-                minDistance = -1
-                for newMini in nameSet:
-                    newLocation = D.objects[name].location
-                    oldLocation = D.objects[newMini].location
-                    shiftPath = newLocation - oldLocation
-                    if minDistance == -1:
-                        minDistance = shiftPath.length
-                        properMini = newMini
-                    elif shiftPath.length < minDistance:
-                        minDistance = shiftPath.length
-                        properMini = newMini
-                newLocation = D.objects[name].location
-                oldLocation = D.objects[properMini].location
-                shiftPath = newLocation - oldLocation
-                shiftPath = [ai for ai in shiftPath]
+                newLocation = np.array(D.objects[name].location)
+                oldLocations = np.array(
+                    [D.objects[newMini].location for newMini in nameSet]
+                )
+                shiftPaths = newLocation - oldLocations
+                # the closest curve has the smallest squared distance too
+                closest = np.argmin((shiftPaths ** 2).sum(axis=1))
+                shiftPath = shiftPaths[closest].tolist()
                 self.morphPaths.append(shiftPath)
                 self.tampered[i] = True
                 self.colorSubprocess(name, texObj.objColor)
             i += 1
+        # hide the untampered until they're title-sequenced in
+        hidden = [
+            D.objects[name]
+            for name, tampered in zip(self.name, self.tampered)
+            if not tampered
+        ]
+        for obj in hidden:
+            obj.hide_render = True
+            obj.hide_viewport = True
+        paths = np.asarray(self.morphPaths, dtype=np.float64).reshape(-1, 3)
+        # only the curves that actually move need to be shifted
+        moving = np.flatnonzero(np.any(paths != 0, axis=1))
+        movingNames = [self.name[j] for j in moving]
         # now, time to actually shift the tampered
         # first, shift backwards
-        for name, shiftAmount in zip(self.name, self.morphPaths):
-            tempShift = tuple(-ai for ai in shiftAmount)
-            # shift the untampered out-of-sight
-            if tempShift == ORIGIN:
-                tempShift = (100, 0, 0)
-            self.miniShift(name, tempShift)
+        for name, shiftAmount in zip(movingNames, paths[moving]):
+            self.miniShift(name, -shiftAmount)
         # now shift to their correct spots with raw rendering and the correct rate
-        t = interpolate(0, halfRuntime, rate)
-        t = [i / halfRuntime for i in t]
-        diff = [t[i + 1] - t[i] for i in range(len(t) - 1)]
+        diff = np.diff(interpolate(0, halfRuntime, rate)) / halfRuntime
         if render:
             f.start()
         numFrames = round(FRAME_RATE * halfRuntime)
+        # every moving glyph's shift for every frame, as a (numFrames, numMoving, 3)
+        # array
+        frameShifts = diff[:numFrames, None, None] * paths[moving][None, :, :]
         for i in range(numFrames):
-            for name, shiftAmount in zip(self.name, self.morphPaths):
-                tempShift = tuple(ai * diff[i] for ai in shiftAmount)
+            for name, tempShift in zip(movingNames, frameShifts[i]):
                 self.miniShift(name, tempShift)
             if render:
                 f.r()
         if render:
             f.stop()
-        # now, undo the out-of-sight shift
-        for name, shiftAmount in zip(self.name, self.morphPaths):
-            tempShift = tuple(-ai for ai in shiftAmount)
-            # shift the untampered back in sight
-            if tempShift == ORIGIN:
-                tempShift = (-100, 0, 0)
-                self.miniShift(name, tempShift)
+        # now, bring the untampered back in sight
+        for obj in hidden:
+            obj.hide_render = False
+            obj.hide_viewport = False
         # then, do a title sequence in
         self.titleSequenceIn(f, texObj.objColor, halfRuntime, render)
 
@@ -380,10 +363,7 @@ class Tex(Blobject):
         self.rotate(Y, PI / 2)
         fadeStack = self.init_fade(t0, tf, rate, color, True)
         rotateStack = self.init_rotate(t0, tf, rate, Y, -PI / 2)
-        stack = deque()
-        for i, colVal, rotVal in zip(range(len(rotateStack)), fadeStack, rotateStack):
-            stack.append([i, colVal, rotVal])
-        return stack
+        return deque(zip(range(len(rotateStack)), fadeStack, rotateStack))
     def update_titleIn(self, val, color=WHITE):
         self.color(val[1])
         self.rotate(Y, val[2])
@@ -602,7 +582,8 @@ class TexManager(object):
         if twistable == None:
             twistable = self.twistable
         if relative == True and len(self.texs) > 0:
-            origin = addition(origin, self.texs[-1].origin)
+            o = self.texs[-1].origin
+            origin = (origin[0] + o[0], origin[1] + o[1], origin[2] + o[2])
         self.texs.append(Tex(expression, scale, twistable, origin))
         if type(morphIdx) is int:
             if self.noMorph and not self.f.render:
@@ -614,6 +595,42 @@ class TexManager(object):
         else:
             raise CustomError("morphIdx must be an int or False")
 
+    def insertMany(
+        self,
+        expressions,
+        origin=ORIGIN,
+        morphIdx=-2,
+        scale=None,
+        twistable=None,
+        relative=True,
+        runtime=2,
+    ):
+        """
+        Inserts several Tex objects one after another, just like calling insert() on
+        each of them. The difference is that all of the expressions are rendered in
+        a single LaTeX run up front, which is a lot faster for derivations and lists.
+
+        Args:
+            expressions (list): Tex expressions of the new Tex objects.
+            origin (tuple, optional): origin passed to insert() for every new Tex
+                object. Defaults to ORIGIN.
+            morphIdx (int, optional): morphIdx passed to insert() for every new Tex
+                object. Defaults to -2.
+            scale (float, optional): scale of the new Tex objects. Defaults to None,
+                in which case it's the scale of the TexManager.
+            twistable (bool, optional): whether or not the Texs are twistable.
+                Defaults to None, in which case it's the twistable of the TexManager.
+            relative (bool, optional): whether or not origin is relative to the
+                previous Tex or absolute. Defaults to True, so relative.
+            runtime (int, optional): the runtime of each morphing or title-sequence.
+                Defaults to 2.
+        """
+        tex_to_svg_files(expressions)
+        for expression in expressions:
+            self.insert(
+                expression, origin, morphIdx, scale, twistable, relative, runtime
+            )
+
     def shift(self, indices=True, amt=[1, 0, 0], runtime=2):
         """Shifts some or all of the Tex objects that are a part of the TexManager.
 
@@ -698,6 +715,7 @@ class TexManager(object):
 # necessary tex stuff below
 # the following five functions are adapted from
 # https://github.com/3b1b/manim
+@lru_cache(maxsize=4096)
 def tex_hash(expression):
     """Returns a truncated hash of an input expression.
 
@@ -705,56 +723,420 @@ def tex_hash(expression):
         expression (str): the expression that would be passed into a Tex object.
 
     Returns:
-        str: 16-byte truncated hash of expression.
+        str: 16-character hex hash of expression.
     """
-    id_str = str(expression)
-    hasher = sha256()
-    hasher.update(id_str.encode())
-    # truncating at 16 bytes for cleanliness
+    # an 8-byte blake2b digest is as long as the truncated sha256 used before it,
+    # but quicker to compute
     # see "birthday paradox"
     # after roughly 10,000,000 SVG files (~10 GB) are generated,
     # the probability of collision is 3 in a million...
-    return hasher.hexdigest()[:16]
-def tex_to_svg_file(expression):
+    return blake2b(str(expression).encode(), digest_size=8).hexdigest()
+def legacy_tex_hash(expression):
+    """
+    Returns the truncated sha256 hash that SVG files used to be named by, so that
+    SVGs rendered before the switch to blake2b can still be found.
+
+    Args:
+        expression (str): the expression that would be passed into a Tex object.
+
+    Returns:
+        str: 16-character hex hash of expression.
+    """
+    return sha256(str(expression).encode()).hexdigest()[:16]
+def existing_svg_file(expression, h=None):
+    """
+    Looks for an SVG of expression that's already been rendered into SVG_DIR. An SVG
+    still named by legacy_tex_hash() is renamed to its tex_hash() name on the way.
+
+    Args:
+        expression (str): the expression that would be passed into a Tex object.
+        h (str, optional): tex_hash(expression), if already known. Defaults to None.
+
+    Returns:
+        str: filename of the rendered SVG, or None if there isn't one.
+    """
+    svg_file = os.path.join(SVG_DIR, h or tex_hash(expression)) + ".svg"
+    if os.path.exists(svg_file):
+        return svg_file
+    legacy_file = os.path.join(SVG_DIR, legacy_tex_hash(expression)) + ".svg"
+    if os.path.exists(legacy_file):
+        os.replace(legacy_file, svg_file)
+        return svg_file
+    return None
+def tex_to_svg_file(expression, h=None):
     """At a high level, renders a Tex document into an SVG file.
 
     Args:
         expression (str): the expression that would be passed into a Tex object.
+        h (str, optional): tex_hash(expression), if already known. Defaults to None.
+
+    Returns:
+        str: filename of rendered SVG.
+    """
+    global _manifestDirty
+    h = h or tex_hash(expression)
+    svg_file = _TEX_SVG_CACHE.get(h)
+    if svg_file:
+        return svg_file
+    # skip LaTeX entirely if a previous run already rendered this expression - the
+    # file is checked once here, since SVG_DIR may have been cleared since loading
+    if h in _SVG_MANIFEST:
+        svg_file = os.path.join(SVG_DIR, _SVG_MANIFEST[h])
+        if os.path.exists(svg_file):
+            _TEX_SVG_CACHE[h] = svg_file
+            return svg_file
+        del _SVG_MANIFEST[h]
+        _manifestDirty = True
+    svg_file = existing_svg_file(expression, h)
+    if not svg_file:
+        fmt = tex_format()
+        # step 1
+        tex_file = generate_tex_file(expression, h, fmt)
+        # step 2
+        dvi_file = tex_to_dvi(tex_file, fmt)
+        # step 3
+        svg_file = dvi_to_svg(dvi_file)
+        # step 4
+        delete_extras(expression, h)
+    _TEX_SVG_CACHE[h] = svg_file
+    _SVG_MANIFEST[h] = os.path.basename(svg_file)
+    _manifestDirty = True
+    return svg_file
+def tex_to_svg_files(expressions):
+    """
+    Renders many Tex expressions at once. Every expression that hasn't been rendered
+    yet goes onto its own page of a single LaTeX document, so LaTeX and dvisvgm only
+    start up once for the whole batch. Each page is then saved under the hash of its
+    expression, exactly where tex_to_svg_file() would have put it.
+
+    Args:
+        expressions (list): the expressions that would be passed into Tex objects.
+
+    Returns:
+        list: filenames of rendered SVGs, in the same order as expressions.
+    """
+    global _manifestDirty
+    hashes = [tex_hash(expression) for expression in expressions]
+    pending = []
+    # hashes already looked at, so repeated expressions are only checked once
+    seen = set()
+    for expression, h in zip(expressions, hashes):
+        if h in seen:
+            continue
+        seen.add(h)
+        if (
+            h not in _TEX_SVG_CACHE
+            and h not in _SVG_MANIFEST
+            and not existing_svg_file(expression, h)
+        ):
+            pending.append(expression)
+    # a single expression gains nothing from batching
+    if len(pending) > 1:
+        batchExpression = "\n".join(pending)
+        try:
+            tex_file = generate_batch_tex_file(batchExpression, pending)
+            dvi_file = tex_to_dvi(tex_file)
+            svg_files = dvi_to_svgs(dvi_file, len(pending))
+        except CustomError:
+            # compile each Tex on its own, so the culprit's own error is raised when
+            # its Tex is constructed
+            svg_files = []
+            compile_tex_concurrently(pending)
+        for expression, svg_file in zip(pending, svg_files):
+            h = tex_hash(expression)
+            result = os.path.join(SVG_DIR, h) + ".svg"
+            os.replace(svg_file, result)
+            _TEX_SVG_CACHE[h] = result
+            _SVG_MANIFEST[h] = os.path.basename(result)
+            _manifestDirty = True
+        delete_extras(batchExpression)
+    return [
+        tex_to_svg_file(expression, h) for expression, h in zip(expressions, hashes)
+    ]
+def compile_tex_concurrently(expressions):
+    """
+    Renders each expression into its own SVG, running the latex and dvisvgm processes
+    of different expressions at the same time, at most one per CPU core. Expressions
+    that LaTeX or dvisvgm fail on are skipped, so that the error is raised when their
+    Tex is constructed.
+
+    Args:
+        expressions (list): the expressions that would be passed into Tex objects.
+
+    Raises:
+        Exception: the first error other than a CustomError, once every expression
+            that did render has been recorded.
+    """
+    global _manifestDirty
+    fmt = tex_format()
+
+    async def compileAll():
+        # keep about one process per core going, so one expression's dvisvgm overlaps
+        # the next one's latex without thrashing the disk
+        semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+
+        async def compileOne(expression):
+            async with semaphore:
+                return await tex_to_svg_async(expression, fmt)
+
+        return await asyncio.gather(
+            *[compileOne(expression) for expression in expressions],
+            return_exceptions=True,
+        )
+
+    # subprocesses need the proactor loop on Windows before Python 3.8
+    loop = asyncio.ProactorEventLoop() if os.name == "nt" else asyncio.new_event_loop()
+    try:
+        previousLoop = asyncio.get_event_loop()
+    except RuntimeError:
+        previousLoop = None
+    # on POSIX before Python 3.8, the child watcher only reaps subprocesses for the
+    # current event loop - without this, spawning fails or waiting never returns
+    asyncio.set_event_loop(loop)
+    try:
+        results = loop.run_until_complete(compileAll())
+    finally:
+        asyncio.set_event_loop(previousLoop)
+        loop.close()
+    unexpected = None
+    for expression, svg_file in zip(expressions, results):
+        if isinstance(svg_file, CustomError):
+            continue
+        if isinstance(svg_file, Exception):
+            unexpected = unexpected or svg_file
+            continue
+        h = tex_hash(expression)
+        _TEX_SVG_CACHE[h] = svg_file
+        _SVG_MANIFEST[h] = os.path.basename(svg_file)
+        _manifestDirty = True
+    # anything else (latex missing from PATH, say) won't go away by retrying per Tex
+    if unexpected:
+        raise unexpected
+async def tex_to_svg_async(expression, fmt=""):
+    """
+    The same four steps as tex_to_svg_file(), but awaiting latex and dvisvgm instead
+    of blocking on them.
+
+    Args:
+        expression (str): the expression that would be passed into a Tex object.
+        fmt (str, optional): precompiled format from tex_format(). Defaults to "".
+
+    Raises:
+        CustomError: general error when the Tex file can't be converted.
 
     Returns:
         str: filename of rendered SVG.
     """
-    # step 1
-    tex_file = generate_tex_file(expression)
-    # step 2
-    dvi_file = tex_to_dvi(tex_file)
-    # step 3
-    svg_file = dvi_to_svg(dvi_file)
-    # step 4
-    delete_extras(expression)
+    h = tex_hash(expression)
+    tex_file = generate_tex_file(expression, h, fmt)
+    dvi_file = tex_file.replace(".tex", ".dvi")
+    svg_file = os.path.join(SVG_DIR, h) + ".svg"
+    proc = await asyncio.create_subprocess_exec(
+        *latex_commands(tex_file, fmt),
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        log_file = tex_file.replace(".tex", ".log")
+        raise CustomError(
+            "Latex error converting to dvi. See log file at: %s\n%s"
+            % (log_file, stderr.decode(errors="replace"))
+        )
+    proc = await asyncio.create_subprocess_exec(
+        "dvisvgm",
+        dvi_file,
+        "-n",
+        "-v",
+        "0",
+        "-o",
+        svg_file,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await proc.communicate()
+    if proc.returncode != 0 or not os.path.exists(svg_file):
+        raise CustomError(
+            "dvisvgm error converting %s to svg\n%s"
+            % (dvi_file, stderr.decode(errors="replace"))
+        )
+    delete_extras(expression, h)
     return svg_file
-def generate_tex_file(expression):
+def load_svg_manifest():
+    """
+    Loads the SVG manifest from SVG_DIR, keeping only the entries whose SVG file is
+    still there. A missing or unreadable manifest just starts an empty one.
+    """
+    global _manifestDirty
+    try:
+        with open(_SVG_MANIFEST_FILE, "r", encoding="utf-8") as infile:
+            manifest = json.load(infile)
+        existing = set(os.listdir(SVG_DIR))
+    except (OSError, ValueError):
+        return
+    _SVG_MANIFEST.clear()
+    for h, svg_file in manifest.items():
+        if svg_file in existing:
+            _SVG_MANIFEST[h] = svg_file
+    _manifestDirty = _manifestDirty or len(_SVG_MANIFEST) != len(manifest)
+def save_svg_manifest():
+    """
+    Writes the SVG manifest back to SVG_DIR if anything changed since it was loaded,
+    merged with whatever other sessions have saved in the meantime. Registered to run
+    when the interpreter exits.
+    """
+    global _manifestDirty
+    if not _manifestDirty:
+        return
+    # re-read the manifest so another Blender session's renders aren't overwritten
+    try:
+        with open(_SVG_MANIFEST_FILE, "r", encoding="utf-8") as infile:
+            manifest = json.load(infile)
+    except (OSError, ValueError):
+        manifest = {}
+    manifest.update(_SVG_MANIFEST)
+    existing = set(os.listdir(SVG_DIR))
+    manifest = {h: svg_file for h, svg_file in manifest.items() if svg_file in existing}
+    # write to a file of our own and swap it in, so a reader never sees half of it
+    tmp_file = "%s.%d" % (_SVG_MANIFEST_FILE, os.getpid())
+    with open(tmp_file, "w", encoding="utf-8") as outfile:
+        json.dump(manifest, outfile, indent=0, sort_keys=True)
+    os.replace(tmp_file, _SVG_MANIFEST_FILE)
+    _manifestDirty = False
+def tex_format():
+    """
+    Returns the precompiled LaTeX format for the preamble in TEMPLATE_TEX_FILE_BODY,
+    building it the first time and keeping it in SVG_DIR. Loading the format is much
+    quicker than loading every package in the preamble again for each Tex. The format
+    is named after a hash of the preamble, so changing the preamble builds a new one.
+
+    Raises:
+        CustomError: general error when the preamble can't be precompiled.
+
+    Returns:
+        str: format path without the .fmt extension.
+    """
+    global _texFormat
+    if _texFormat is not None:
+        return _texFormat
+    preamble = TEMPLATE_TEX_FILE_BODY.split("\\begin{document}")[0]
+    name = "peeps-" + tex_hash(preamble)
+    result = os.path.join(SVG_DIR, name)
+    if not os.path.exists(result + ".fmt"):
+        # build in the scratch dir, so only the finished format lands in SVG_DIR
+        fileBeginning = os.path.join(_TEX_SCRATCH_DIR, name)
+        with open(fileBeginning + ".tex", "w", encoding="utf-8") as outfile:
+            outfile.write(preamble)
+        commands = [
+            "latex",
+            "-ini",
+            "-interaction=batchmode",
+            "-halt-on-error",
+            "-output-directory=" + _TEX_SCRATCH_DIR,
+            "-jobname=" + name,
+            "&latex {}\\dump".format(fileBeginning + ".tex"),
+        ]
+        proc = subprocess.run(
+            commands, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
+        if proc.returncode != 0 or not os.path.exists(fileBeginning + ".fmt"):
+            raise CustomError(
+                "Latex error precompiling the preamble. See log file at: %s\n%s"
+                % (fileBeginning + ".log", proc.stderr.decode(errors="replace"))
+            )
+        # the scratch dir may be on another filesystem, so copy the format next to
+        # its final name first and then swap it in whole
+        tmp_file = "%s.fmt.%d" % (result, os.getpid())
+        shutil.move(fileBeginning + ".fmt", tmp_file)
+        os.replace(tmp_file, result + ".fmt")
+        for extension in (".tex", ".log"):
+            try:
+                os.remove(fileBeginning + extension)
+            except FileNotFoundError:
+                pass
+    _texFormat = result
+    return _texFormat
+def generate_tex_file(expression, h=None, fmt=""):
     """Creates a Tex file out of a LaTeX expression. (step 1)
 
     Args:
         expression (str): LaTeX expression.
+        h (str, optional): tex_hash(expression), if already known. Defaults to None.
+        fmt (str, optional): precompiled format from tex_format() that already holds
+            the preamble, in which case only the document body is written. Defaults
+            to "".
 
     Returns:
         str: Tex filename.
     """
-    result = os.path.join(SVG_DIR, tex_hash(expression)) + ".tex"
-    svgResult = os.path.join(SVG_DIR, tex_hash(expression)) + ".svg"
+    h = h or tex_hash(expression)
+    result = os.path.join(_TEX_SCRATCH_DIR, h) + ".tex"
+    svgResult = os.path.join(SVG_DIR, h) + ".svg"
     if not os.path.exists(svgResult):
         print('Writing "%s" to %s' % ("".join(expression), result))
         new_body = TEMPLATE_TEX_FILE_BODY.replace("YOUR_TEXT_HERE", expression)
+        if fmt:
+            new_body = new_body[new_body.index("\\begin{document}") :]
         with open(result, "w", encoding="utf-8") as outfile:
             outfile.write(new_body)
     return result
-def tex_to_dvi(tex_file):
+def generate_batch_tex_file(batchExpression, expressions):
+    """
+    Creates a single multi-page Tex file with one expression per page. (step 1 for
+    tex_to_svg_files())
+
+    Args:
+        batchExpression (str): all of the expressions joined together, used to name
+            the file.
+        expressions (list): LaTeX expressions, one per page.
+
+    Returns:
+        str: Tex filename.
+    """
+    result = os.path.join(_TEX_SCRATCH_DIR, tex_hash(batchExpression)) + ".tex"
+    preamble, body = TEMPLATE_TEX_FILE_BODY.split("\\begin{document}")
+    preamble = preamble.replace("[preview]", "[preview, multi=peepspage]", 1)
+    page = body.replace("\\end{document}", "")
+    pages = "".join(
+        "\\begin{peepspage}"
+        + page.replace("YOUR_TEXT_HERE", expression)
+        + "\\end{peepspage}"
+        for expression in expressions
+    )
+    print("Writing %d expressions to %s" % (len(expressions), result))
+    with open(result, "w", encoding="utf-8") as outfile:
+        outfile.write(preamble + "\\begin{document}" + pages + "\\end{document}")
+    return result
+def latex_commands(tex_file, fmt=""):
+    """
+    Builds the latex command line that compiles a Tex file into a DVI file in the
+    scratch dir, shared by tex_to_dvi() and tex_to_svg_async().
+
+    Args:
+        tex_file (str): Tex filename.
+        fmt (str, optional): precompiled format from tex_format() to compile with.
+            Defaults to "", in which case the Tex file loads its own preamble.
+
+    Returns:
+        list: the latex command and its arguments.
+    """
+    commands = [
+        "latex",
+        "-interaction=batchmode",
+        "-halt-on-error",
+        "-output-directory=" + _TEX_SCRATCH_DIR,
+        tex_file,
+    ]
+    if fmt:
+        commands.insert(1, "-fmt=" + fmt)
+    return commands
+def tex_to_dvi(tex_file, fmt=""):
     """Creates a DVI file out of a Tex file. (step 2)
 
     Args:
         tex_file (str): Tex filename.
+        fmt (str, optional): precompiled format from tex_format() to compile with.
+            Defaults to "", in which case the Tex file loads its own preamble.
 
     Raises:
         CustomError: general error when Tex file can't be converted into DVI file.
@@ -763,22 +1145,19 @@ def tex_to_dvi(tex_file):
         str: DVI filename.
     """
     result = tex_file.replace(".tex", ".dvi")
-    svgResult = tex_file.replace(".tex", ".svg")
+    name = os.path.splitext(os.path.basename(tex_file))[0]
+    svgResult = os.path.join(SVG_DIR, name) + ".svg"
     if not os.path.exists(svgResult):
-        commands = [
-            "latex",
-            "-interaction=batchmode",
-            "-halt-on-error",
-            '-output-directory="{}"'.format(SVG_DIR),
-            '"{}"'.format(tex_file),
-            ">",
-            os.devnull,
-        ]
-        exit_code = os.system(" ".join(commands))
-        if exit_code != 0:
+        proc = subprocess.run(
+            latex_commands(tex_file, fmt),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        if proc.returncode != 0:
             log_file = tex_file.replace(".tex", ".log")
             raise CustomError(
-                ("Latex error converting to dvi. ") + "See log file at: %s" % log_file
+                "Latex error converting to dvi. See log file at: %s\n%s"
+                % (log_file, proc.stderr.decode(errors="replace"))
             )
     return result
 def dvi_to_svg(dvi_file):
@@ -793,38 +1172,69 @@ def dvi_to_svg(dvi_file):
     Returns:
         str: SVG filename.
     """
-    result = dvi_file.replace(".dvi", ".svg")
+    name = os.path.splitext(os.path.basename(dvi_file))[0]
+    result = os.path.join(SVG_DIR, name) + ".svg"
     if not os.path.exists(result):
-        commands = [
-            "dvisvgm",
-            '"{}"'.format(dvi_file),
-            "-n",
-            "-v",
-            "0",
-            "-o",
-            '"{}"'.format(result),
-            ">",
-            os.devnull,
-        ]
-        os.system(" ".join(commands))
+        commands = ["dvisvgm", dvi_file, "-n", "-v", "0", "-o", result]
+        subprocess.run(commands, stdout=subprocess.DEVNULL)
+    return result
+
+def dvi_to_svgs(dvi_file, numPages):
+    """
+    Converts every page of a multi-page DVI file into its own SVG file. (step 3 for
+    tex_to_svg_files())
+
+    Args:
+        dvi_file (str): DVI filename.
+        numPages (int): number of pages in the DVI file.
+
+    Raises:
+        CustomError: general error when the DVI file can't be converted into SVGs.
+
+    Returns:
+        list: SVG filenames, one per page.
+    """
+    digits = len(str(numPages))
+    name = os.path.splitext(os.path.basename(dvi_file))[0]
+    fileBeginning = os.path.join(SVG_DIR, name)
+    commands = [
+        "dvisvgm",
+        dvi_file,
+        "-n",
+        "-p",
+        "1-",
+        "-v",
+        "0",
+        "-o",
+        "{}-%{}p.svg".format(fileBeginning, digits),
+    ]
+    proc = subprocess.run(commands, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    result = [
+        "{}-{}.svg".format(fileBeginning, str(i).zfill(digits))
+        for i in range(1, numPages + 1)
+    ]
+    for svg_file in result:
+        if not os.path.exists(svg_file):
+            raise CustomError(
+                "dvisvgm error converting %s to svg\n%s"
+                % (dvi_file, proc.stderr.decode(errors="replace"))
+            )
     return result
 
-def delete_extras(expression):
+def delete_extras(expression, h=None):
     """Deletes all the unnecessary extras - I only need the svg. (step 4)
 
     Args:
         expression (str): original Tex expression
+        h (str, optional): tex_hash(expression), if already known. Defaults to None.
     """
-    fileBeginning = os.path.join(SVG_DIR, tex_hash(expression))
-    # check for each filetype
-    if os.path.exists(fileBeginning + ".tex"):
-        os.remove(fileBeginning + ".tex")
-    if os.path.exists(fileBeginning + ".log"):
-        os.remove(fileBeginning + ".log")
-    if os.path.exists(fileBeginning + ".dvi"):
-        os.remove(fileBeginning + ".dvi")
-    if os.path.exists(fileBeginning + ".aux"):
-        os.remove(fileBeginning + ".aux")
+    fileBeginning = os.path.join(_TEX_SCRATCH_DIR, h or tex_hash(expression))
+    # just try removing each filetype instead of checking for it first
+    for extension in (".tex", ".log", ".dvi", ".aux"):
+        try:
+            os.remove(fileBeginning + extension)
+        except FileNotFoundError:
+            pass
 
 def morphParser(strToParse):
     """
@@ -850,3 +1260,7 @@ def morphParser(strToParse):
     if len(secondSplit) != 1:
         raise CustomError(strToParse + " is too long. time to add a new case?")
     return secondSplit[-1]
+
+load_svg_manifest()
+atexit.register(save_svg_manifest)
+atexit.register(shutil.rmtree, _TEX_SCRATCH_DIR, True)
@@ -81,6 +81,7 @@ MAKE_DARK = (0, 1, 1, 1)
 # other constants
 PI = np.pi
 TAU = 2 * PI
+DEG_TO_RAD = PI / 180
 GOLDEN_RATIO = (np.sqrt(5) + 1) / 2
 GOLDEN_ANGLE = (2 - GOLDEN_RATIO) * TAU
 G_ACCEL = 9.8  # m/s^2
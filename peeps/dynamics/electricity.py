@@ -1,8 +1,30 @@
-import mathutils as mut
 import numpy as np
 from constants import CustomError, K_COULOMB, dt, A2
 from blobjects.shapes import Vector
-from externals.iterable_utils import difference, mag, addition, subtraction
+
+def _coulombForces(positions, charges):
+    """
+    Computes the net Coulomb force on every charge due to all of the others in one
+    broadcasted pass.
+
+    Args:
+        positions (numpy.ndarray): (N, 3) array of charge positions.
+        charges (numpy.ndarray): (N,) array of charge values.
+
+    Returns:
+        numpy.ndarray: (N, 3) array of the net force on each charge.
+    """
+    # separations[i, j] points from charge j to charge i
+    separations = positions[:, None, :] - positions[None, :, :]
+    # contract over the last axis directly rather than building squared and scaled
+    # (N, N, 3) temporaries first
+    distSquared = np.einsum("ijk,ijk->ij", separations, separations)
+    # a charge doesn't push on itself
+    np.fill_diagonal(distSquared, np.inf)
+    scales = np.outer(charges, charges)
+    scales *= K_COULOMB
+    scales /= distSquared ** 1.5
+    return np.einsum("ij,ijk->ik", scales, separations)
 
 def computeElectricAccelerations(chargeList=[], scale=1):
     """Determines the accelerations for some charge configuration in space.
@@ -31,28 +53,11 @@ def computeElectricAccelerations(chargeList=[], scale=1):
                 "computeElectricAccelerations() requires all objects in chargeList to have mass and charge properties"
             )
     # given the origins at each charge, compute the force due to each
-    totalForces = []
-    totalAccels = []
-    for q1 in chargeList:
-        # initialize force on charge
-        totalForce = [0, 0, 0]
-        for q2 in chargeList:
-            if q1 == q2:
-                pass
-            else:
-                # determine the force between q1 and q2
-                positionVector = difference(q1.origin, q2.origin)
-                tempScale = (
-                    -K_COULOMB * q1.charge * q2.charge / (mag(positionVector) ** 3)
-                )
-                tempForce = [tempScale * ri for ri in positionVector]
-                totalForce = [
-                    totali + tempi for totali, tempi in zip(totalForce, tempForce)
-                ]
-        totalForces.append(totalForce)
-        totalAccel = [i / q1.mass for i in totalForce]
-        totalAccels.append(totalAccel)
-    return [[i * scale for i in temp] for temp in totalAccels]
+    positions = np.array([c.origin for c in chargeList], dtype=np.float64)
+    charges = np.array([c.charge for c in chargeList], dtype=np.float64)
+    masses = np.array([c.mass for c in chargeList], dtype=np.float64)
+    totalAccels = _coulombForces(positions, charges) / masses[:, None]
+    return (totalAccels * scale).tolist()
 def updateChargeVelocitiesAccelerations(chargeList=[], scale=1):
     """
     Updates the charge velocities and accelerations given the current configuration
@@ -153,50 +158,27 @@ def simulateElectrodynamics(
         staticList = [False] * len(chargeList)
     while len(staticList) < len(chargeList):
         staticList.append(False)
+    # keep the state of every charge in contiguous arrays, one row per charge, and
+    # only push the movement back to the charges themselves
+    positions = np.array([c.origin for c in chargeList], dtype=np.float64)
+    charges = np.array([c.charge for c in chargeList], dtype=np.float64)
+    masses = np.array([c.mass for c in chargeList], dtype=np.float64)
+    velocities = np.array(velocities, dtype=np.float64).reshape(-1, 3)
+    static = np.array(staticList[: len(chargeList)], dtype=bool)
     # given the origins at each charge, compute the force due to each
-    totalForces = []
-    totalAccels = []
-    for q1 in chargeList:
-        # initialize force on charge
-        totalForce = [0, 0, 0]
-        for q2 in chargeList:
-            if q1 == q2:
-                pass
-            else:
-                # determine the force between q1 and q2
-                positionVector = difference(q1.origin, q2.origin)
-                tempScale = (
-                    -K_COULOMB * q1.charge * q2.charge / (mag(positionVector) ** 3)
-                )
-                tempForce = [tempScale * ri for ri in positionVector]
-                totalForce = [
-                    totali + tempi for totali, tempi in zip(totalForce, tempForce)
-                ]
-        totalForces.append(totalForce)
-        totalAccel = [i / q1.mass for i in totalForce]
-        totalAccels.append(totalAccel)
+    forces = _coulombForces(positions, charges)
+    accels = forces / masses[:, None]
 
     # determine the appropriate scaling factor for the acceleration and force vectors
-    maximumForce = 0
-    for vec in totalForces:
-        if mag(vec) > maximumForce:
-            maximumForce = mag(vec)
-    forceScalingFactor = initialForceVisual / maximumForce
-
-    maximumAccel = 0
-    for vec in totalAccels:
-        if mag(vec) > maximumAccel:
-            maximumAccel = mag(vec)
+    forceScalingFactor = initialForceVisual / np.linalg.norm(forces, axis=1).max()
     # based off of x = 1/2*a*t^2, where initialMovement occurs in one second
     # as a crappy approximation, the force is constant over the relevant time period
-    accelScalingFactor = 2 * initialMovement / maximumAccel
+    accelScalingFactor = 2 * initialMovement / np.linalg.norm(accels, axis=1).max()
 
     # initiate force vectors
     forceObjs = []
     if showForces:
-        for i in range(len(totalForces)):
-            vec = totalForces[i]
-            visualForce = [veci * forceScalingFactor for veci in vec]
+        for i, visualForce in enumerate((forces * forceScalingFactor).tolist()):
             forceObjs.append(
                 Vector(
                     visualForce[0], visualForce[1], visualForce[2], chargeList[i].origin
@@ -212,78 +194,54 @@ def simulateElectrodynamics(
     else:
         f.temporaryRender()
     while tcurr < tf:
-        for i in range(len(chargeList)):
-            q1 = chargeList[i]
-            accel = totalAccels[i]
-            vel = velocities[i]
-            force = totalForces[i]
-            if showForces:
-                forceVec = forceObjs[i]
-            # move charges based on their current velocities
-            if not staticList[i]:
-                dx = [veli * dt for veli in vel]
-                # check if dx would push the charge over the boundary
-                if constrained:
-                    newSpot = addition(dx, q1.origin)
-                    newRadius = subtraction(newSpot, constraintOrigin)
-                    if mag(newRadius) > constraintRadius:
-                        # determine the parallel component of movement,
-                        # i.e. the perpendicular of dx with respect to some radial vector
-                        mutDx = mut.Vector(tuple(dx))
-                        mutRadius = mut.Vector(tuple(newRadius))
-                        unitVec = mutRadius.normalized()
-                        # turn dx into the parallel-to-surface / perp-to-radius version
-                        dx = mutDx - (mutDx.dot(unitVec)) * unitVec
-                        if not allowZMovement:
-                            dx = [dx[0], dx[1], 0]
-                        # do a final check for movement beyond the boundary - can happen because of small
-                        # perpendicular movements creating an outward spiral
-                        newSpot = addition(dx, q1.origin)
-                        newRadius = subtraction(newSpot, constraintOrigin)
-                        if mag(newRadius) > constraintRadius:
-                            # determine the projection between here and the edge that's less than the radius
-                            mutRadius = mut.Vector(tuple(newRadius))
-                            # find a radius within constraint - prefer to move here instead
-                            preferredRadius = mutRadius.normalized() * constraintRadius
-                            dx = subtraction(preferredRadius, q1.origin)
-                            if not allowZMovement:
-                                dx = [dx[0], dx[1], 0]
-                q1.shift(dx[0], dx[1], dx[2])
-                if showForces:
-                    forceVec.shift(dx[0], dx[1], dx[2])
-        for i in range(len(chargeList)):
-            q1 = chargeList[i]
-            accel = totalAccels[i]
-            vel = velocities[i]
-            force = totalForces[i]
-            if showForces:
-                forceVec = forceObjs[i]
-            # update the forces, the accelerations, and the velocities
-            # initialize force on charge
-            totalForce = [0, 0, 0]
-            for q2 in chargeList:
-                if q1 == q2:
-                    pass
-                else:
-                    # determine the force between q1 and q2
-                    positionVector = difference(q1.origin, q2.origin)
-                    tempScale = (
-                        -K_COULOMB * q1.charge * q2.charge / (mag(positionVector) ** 3)
-                    )
-                    tempForce = [tempScale * ri for ri in positionVector]
-                    totalForce = [
-                        totali + tempi for totali, tempi in zip(totalForce, tempForce)
-                    ]
-            totalForces[i] = totalForce
-            totalAccels[i] = [totali / q1.mass for totali in totalForce]
-            # update velocities and forceObjs[i]
-            velocities[i] = [
-                veli + accelScalingFactor * a * dt
-                for veli, a in zip(velocities[i], accel)
-            ]
-            visualForce = [veci * forceScalingFactor for veci in force]
+        # move charges based on their current velocities
+        dx = velocities * dt
+        dx[static] = 0
+        # check if dx would push the charge over the boundary
+        if constrained:
+            center = np.asarray(constraintOrigin, dtype=np.float64)
+            newRadius = positions + dx - center
+            newRadiusLength = np.linalg.norm(newRadius, axis=1)
+            outside = ~static & (newRadiusLength > constraintRadius)
+            if outside.any():
+                # turn dx into the parallel-to-surface / perp-to-radius version
+                unitVecs = newRadius[outside] / newRadiusLength[outside, None]
+                outsideDx = dx[outside]
+                outsideDx -= (outsideDx * unitVecs).sum(axis=1)[:, None] * unitVecs
+                if not allowZMovement:
+                    outsideDx[:, 2] = 0
+                # do a final check for movement beyond the boundary - can happen
+                # because of small perpendicular movements creating an outward spiral
+                origins = positions[outside]
+                newRadius = origins + outsideDx - center
+                newRadiusLength = np.linalg.norm(newRadius, axis=1)
+                spiral = newRadiusLength > constraintRadius
+                # move onto the edge along the radius instead
+                outsideDx[spiral] = (
+                    center
+                    + newRadius[spiral]
+                    * (constraintRadius / newRadiusLength[spiral])[:, None]
+                    - origins[spiral]
+                )
+                if not allowZMovement:
+                    outsideDx[:, 2] = 0
+                dx[outside] = outsideDx
+        for i in np.flatnonzero(~static):
+            shift = dx[i].tolist()
+            chargeList[i].shift(*shift)
             if showForces:
+                forceObjs[i].shift(*shift)
+        positions += dx
+        # update velocities and forceObjs with the forces from before the move
+        velocities += accelScalingFactor * accels * dt
+        if showForces:
+            for forceVec, visualForce in zip(
+                forceObjs, (forces * forceScalingFactor).tolist()
+            ):
                 forceVec.transform(visualForce[0], visualForce[1], visualForce[2])
+        # update the forces and the accelerations at the new positions
+        forces = _coulombForces(positions, charges)
+        accels = forces / masses[:, None]
         tcurr = tcurr + dt
         if render:
             f.r()
@@ -1,11 +1,7 @@
-import math
-import mathutils as mut
 import numpy as np
-from constants import CustomError, PI, LINEAR, K_COULOMB, A3
+from constants import CustomError, PI, K_COULOMB, A3
 from blobjects.shapes import FieldLine
-from externals.bezier_interpolation import interpolate
 from externals.blender_utils import delete
-from externals.iterable_utils import addition, difference
 
 # only supports 2D for now...
 def generateFieldLines(
@@ -62,93 +58,152 @@ def generateFieldLines(
     RIGHT = boundingBox[1][0] - margin
     TOP = boundingBox[1][1] - margin
     leFieldLines = []
-    leCharges = [np.abs(c.charge) for c in chargeList]
+    leCharges = np.abs([c.charge for c in chargeList])
     newCurveData = []
-    leMin = leCharges[0]
-    for c in leCharges:
-        if c < leMin:
-            leMin = c
-    leFactors = [round(c / leMin * numFactor) for c in leCharges]
+    leFactors = np.rint(leCharges / leCharges.min() * numFactor).astype(int).tolist()
     leMaxLength = 0
     dataCounter = 0
+    # positions and charges of every point charge, plus the distance at which a field
+    # line counts as having hit it
+    chargeOrigins = np.array([q.origin for q in chargeList], dtype=np.float64)
+    chargeValues = np.array([q.charge for q in chargeList], dtype=np.float64)
+    checkLengths = np.array(
+        [q.radius if q.charge > 0 else q.radius + margin for q in chargeList],
+        dtype=np.float64,
+    )
+    # lay out the state of every field line, one row per line, so that all of them
+    # can be traced together
+    lineCoords = []
+    lineSigns = []
+    lineLengths = []
+    lineLimits = []
+    previousFields = []
     # determine the true numFactors for each charge based off of the magnitudes of charges
     for c, leLength, leFactor in zip(chargeList, lengthList, leFactors):
-        angs = interpolate(0, 2 * PI, LINEAR, leFactor)
-        angs.pop()
-        # init field lines in the direction of ang
-        for ang in angs:
+        # first coordinate of every field line around this charge, evenly spread out
+        # on a circle around it
+        if c.charge > 0:
+            leRadius = c.radius
+        else:
+            leRadius = c.radius + margin
+        angs = np.linspace(0, 2 * PI, leFactor, endpoint=False)
+        seeds = np.column_stack(
+            (
+                c.origin[0] + leRadius * np.cos(angs),
+                c.origin[1] + leRadius * np.sin(angs),
+                np.full(leFactor, c.origin[2]),
+            )
+        ).tolist()
+        # init field lines in the direction of each angle
+        for seed in seeds:
             currLength = 0
-            # first coordinate
-            if c.charge > 0:
-                leRadius = c.radius
-            else:
-                leRadius = c.radius + margin
+            previousField = None
             if initialData and initialData[dataCounter]:
                 coords, currLength, previousField = initialData[dataCounter]
                 if c.charge < 0:
                     coords.reverse()
             else:
-                coords = [
-                    addition(
-                        c.origin, (leRadius * np.cos(ang), leRadius * np.sin(ang), 0)
-                    )
-                ]
+                coords = [seed]
             dataCounter += 1
-            # determine coords from here to either
-            # a hit on another charge (within charge's radius + margin) or
-            # a hit on the bounding box
-            endy = coords[-1]
-            if not initialData:
-                previousField = None
-            while (
-                endy[0] > LEFT
-                and endy[0] < RIGHT
-                and endy[1] < TOP
-                and endy[1] > BOTTOM
-            ):
-                # determine a normalized electric field at endy
-                eField = mut.Vector((0, 0, 0))
-                for q in chargeList:
-                    rVec = mut.Vector(tuple(difference(q.origin, endy)))
-                    magField = K_COULOMB * q.charge / rVec.length_squared
-                    eField += magField * rVec.normalized()
-                # move a distance of ds in the direction of the electric field
-                distToMove = np.sign(c.charge) * ds * eField.normalized()
-                # check if line has hit a point charge
-                chargeHit = False
-                for q in chargeList:
-                    diffVec = mut.Vector(tuple(difference(q.origin, endy)))
-                    if q.charge > 0:
-                        checkLength = q.radius
-                    else:
-                        checkLength = q.radius + margin
-                    if diffVec.magnitude <= checkLength and currLength > checkLength:
-                        chargeHit = True
-                        break
-                if chargeHit:
-                    break
-                # check if eField near a stable sink
-                if previousField == None:
-                    previousField = eField.normalized()
-                angBetween = np.arccos(
-                    np.clip(eField.normalized().dot(previousField), -1, 1)
-                )
-                if not math.isnan(angBetween) and angBetween > 1:  # radians
-                    break
-                previousField = eField.normalized()
-                # all checks are good, so append the new point to coords
-                coords.append(tuple(addition(coords[-1], distToMove)))
-                currLength += ds
-                if currLength > leLength:
-                    break
-                # this is the new endy
-                endy = coords[-1]
-            if c.charge < 0:
-                coords.reverse()
-            if currLength > leMaxLength:
-                leMaxLength = currLength
-            newCurveData.append((coords, currLength, previousField))
-            leFieldLines.append(FieldLine(coords))
+            lineCoords.append(coords)
+            lineSigns.append(np.sign(c.charge))
+            lineLengths.append(currLength)
+            lineLimits.append(leLength)
+            previousFields.append(previousField)
+    numLines = len(lineCoords)
+    ends = np.array([coords[-1] for coords in lineCoords], dtype=np.float64)
+    ends = ends.reshape(numLines, 3)
+    steps = ds * np.array(lineSigns, dtype=np.float64)
+    lineLengths = np.array(lineLengths, dtype=np.float64)
+    lineLimits = np.array(lineLimits, dtype=np.float64)
+    hasPrevious = np.array([field is not None for field in previousFields], dtype=bool)
+    previousFields = np.array(
+        [field if field is not None else (0, 0, 0) for field in previousFields],
+        dtype=np.float64,
+    ).reshape(numLines, 3)
+
+    def inBox(points):
+        return (
+            (points[:, 0] > LEFT)
+            & (points[:, 0] < RIGHT)
+            & (points[:, 1] < TOP)
+            & (points[:, 1] > BOTTOM)
+        )
+
+    # determine coords from here to either
+    # a hit on another charge (within charge's radius + margin) or
+    # a hit on the bounding box
+    active = inBox(ends)
+    # the lines that moved on each step and where they moved to, kept as one block
+    # per step rather than one small list per point
+    stepLines = []
+    stepEnds = []
+    while active.any():
+        idx = np.flatnonzero(active)
+        # determine a normalized electric field at the end of every active line,
+        # summed over every charge
+        rVecs = ends[idx, None, :] - chargeOrigins[None, :, :]
+        distSquared = (rVecs ** 2).sum(axis=2)
+        eFields = (
+            (K_COULOMB * chargeValues / distSquared ** 1.5)[:, :, None] * rVecs
+        ).sum(axis=1)
+        eLengths = np.linalg.norm(eFields, axis=1)
+        # a vanishing field has no direction
+        eFields = np.divide(
+            eFields,
+            eLengths[:, None],
+            out=np.zeros_like(eFields),
+            where=eLengths[:, None] > 0,
+        )
+        # check if line has hit a point charge
+        hit = np.any(
+            (np.sqrt(distSquared) <= checkLengths)
+            & (lineLengths[idx, None] > checkLengths),
+            axis=1,
+        )
+        # check if eField near a stable sink
+        first = ~hit & ~hasPrevious[idx]
+        previousFields[idx[first]] = eFields[first]
+        hasPrevious[idx[first]] = True
+        angBetween = np.arccos(
+            np.clip((eFields * previousFields[idx]).sum(axis=1), -1, 1)
+        )
+        stop = hit | (angBetween > 1)  # radians
+        active[idx[stop]] = False
+        # all checks are good, so move a distance of ds in the direction of the
+        # electric field and append the new point to coords
+        go = idx[~stop]
+        previousFields[go] = eFields[~stop]
+        ends[go] += steps[go, None] * eFields[~stop]
+        lineLengths[go] += ds
+        stepLines.append(go)
+        stepEnds.append(ends[go])
+        # stop lines that are long enough or left the box
+        active[go] = (lineLengths[go] <= lineLimits[go]) & inBox(ends[go])
+    # sort the new points out by line, keeping them in step order within each line
+    if stepLines:
+        stepLines = np.concatenate(stepLines)
+        newPoints = np.concatenate(stepEnds)[np.argsort(stepLines, kind="stable")]
+        counts = np.bincount(stepLines, minlength=numLines)
+        for coords, points in zip(
+            lineCoords, np.split(newPoints, np.cumsum(counts)[:-1])
+        ):
+            coords.extend(points.tolist())
+    for coords, sign, currLength, previousField, previous in zip(
+        lineCoords,
+        lineSigns,
+        lineLengths.tolist(),
+        previousFields.tolist(),
+        hasPrevious,
+    ):
+        if sign < 0:
+            coords.reverse()
+        if currLength > leMaxLength:
+            leMaxLength = currLength
+        newCurveData.append(
+            (coords, currLength, tuple(previousField) if previous else None)
+        )
+        leFieldLines.append(FieldLine(coords))
     return (leFieldLines, leMaxLength, newCurveData)
 def playFieldLines(f=None, dLength=0.1, chargeList=[], numFactor=4, render=None):
     """Helper function for animating field line generation via generateFieldLines().
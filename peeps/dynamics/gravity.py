@@ -1,6 +1,36 @@
+import numpy as np
 from constants import CustomError, G_CONST, A2, dt
 from blobjects.shapes import Vector
-from externals.iterable_utils import difference, mag
+
+def _gravitationalForces(positions, masses, pairs=None):
+    """
+    Computes the net gravitational force on every mass due to all of the others. Each
+    pair of masses is only evaluated once, since the force of j on i is just the
+    opposite of the force of i on j.
+
+    Args:
+        positions (numpy.ndarray): (N, 3) array of mass positions.
+        masses (numpy.ndarray): (N,) array of masses.
+        pairs (tuple, optional): np.triu_indices(N, 1), if already known. Defaults to
+            None.
+
+    Returns:
+        numpy.ndarray: (N, 3) array of the net force on each mass.
+    """
+    if pairs is None:
+        pairs = np.triu_indices(len(masses), 1)
+    first, second = pairs
+    # separations[k] points from mass first[k] to mass second[k]
+    separations = positions[second] - positions[first]
+    distSquared = np.einsum("ij,ij->i", separations, separations)
+    # scales[i, j] * (positions[j] - positions[i]) is the pull of j on i, and the
+    # matrix is symmetric
+    scales = np.zeros((len(masses), len(masses)))
+    scales[first, second] = (
+        G_CONST * masses[first] * masses[second] / distSquared ** 1.5
+    )
+    scales[second, first] = scales[first, second]
+    return scales @ positions - scales.sum(axis=1)[:, None] * positions
 
 def simulateGravitationalDynamics(
     f=None,
@@ -87,48 +117,27 @@ def simulateGravitationalDynamics(
         staticList = [False] * len(ballList)
     while len(staticList) < len(ballList):
         staticList.append(False)
+    # keep the state of every mass in contiguous arrays, one row per mass, and only
+    # push the movement back to the balls themselves
+    positions = np.array([b.origin for b in ballList], dtype=np.float64)
+    masses = np.array([b.mass for b in ballList], dtype=np.float64)
+    velocities = np.array(velocities, dtype=np.float64).reshape(-1, 3)
+    static = np.array(staticList[: len(ballList)], dtype=bool)
+    pairs = np.triu_indices(len(ballList), 1)
     # given the origins at each mass, compute the force due to each
-    totalForces = []
-    totalAccels = []
-    for m1 in ballList:
-        # initialize force on mass
-        totalForce = [0, 0, 0]
-        for m2 in ballList:
-            if m1 == m2:
-                pass
-            else:
-                # determine the force between m1 and m2
-                positionVector = difference(m1.origin, m2.origin)
-                tempScale = G_CONST * m1.mass * m2.mass / (mag(positionVector) ** 3)
-                tempForce = [tempScale * ri for ri in positionVector]
-                totalForce = [
-                    totali + tempi for totali, tempi in zip(totalForce, tempForce)
-                ]
-        totalForces.append(totalForce)
-        totalAccel = [totali / m1.mass for totali in totalForce]
-        totalAccels.append(totalAccel)
+    forces = _gravitationalForces(positions, masses, pairs)
+    accels = forces / masses[:, None]
 
     # determine the appropriate scaling factor for the acceleration and force vectors
-    maximumForce = 0
-    for vec in totalForces:
-        if mag(vec) > maximumForce:
-            maximumForce = mag(vec)
-    forceScalingFactor = initialForceVisual / maximumForce
-
-    maximumAccel = 0
-    for vec in totalAccels:
-        if mag(vec) > maximumAccel:
-            maximumAccel = mag(vec)
+    forceScalingFactor = initialForceVisual / np.linalg.norm(forces, axis=1).max()
     # based off of x = 1/2*a*t^2, where initialMovement occurs in one second
     # as a crappy approximation, the force is constant over the relevant time period
-    accelScalingFactor = 2 * initialMovement / maximumAccel
+    accelScalingFactor = 2 * initialMovement / np.linalg.norm(accels, axis=1).max()
 
     # initiate force vectors
     forceObjs = []
     if showForces:
-        for i in range(len(totalForces)):
-            vec = totalForces[i]
-            visualForce = [veci * forceScalingFactor for veci in vec]
+        for i, visualForce in enumerate((forces * forceScalingFactor).tolist()):
             forceObjs.append(
                 Vector(
                     visualForce[0], visualForce[1], visualForce[2], ballList[i].origin
@@ -146,57 +155,35 @@ def simulateGravitationalDynamics(
     else:
         f.temporaryRender()
     while tcurr < tf:
+        # run every step of this frame on the arrays alone, then move the balls and
+        # force Vectors in Blender once by however far they went over all of them
+        frameDx = np.zeros_like(positions)
         for _ in range(steps):
-            for i in range(len(ballList)):
-                m1 = ballList[i]
-                accel = totalAccels[i]
-                vel = velocities[i]
-                force = totalForces[i]
-                if showForces:
-                    forceVec = forceObjs[i]
-                # move masses based on their current velocities
-                if not staticList[i]:
-                    dx = [veli * newDt for veli in vel]
-                    if not allowZMovement:
-                        dx = [dx[0], dx[1], 0]
-                    m1.shift(dx[0], dx[1], dx[2])
-                    if showForces:
-                        forceVec.shift(dx[0], dx[1], dx[2])
-            for i in range(len(ballList)):
-                m1 = ballList[i]
-                accel = totalAccels[i]
-                vel = velocities[i]
-                force = totalForces[i]
-                if showForces:
-                    forceVec = forceObjs[i]
-                # update the forces, the accelerations, and the velocities
-                # initialize force on mass
-                totalForce = [0, 0, 0]
-                for m2 in ballList:
-                    if m1 == m2:
-                        pass
-                    else:
-                        # determine the force between m1 and m2
-                        positionVector = difference(m1.origin, m2.origin)
-                        tempScale = (
-                            G_CONST * m1.mass * m2.mass / (mag(positionVector) ** 3)
-                        )
-                        tempForce = [tempScale * ri for ri in positionVector]
-                        totalForce = [
-                            totali + tempi
-                            for totali, tempi in zip(totalForce, tempForce)
-                        ]
-                totalForces[i] = totalForce
-                totalAccels[i] = [totali / m1.mass for totali in totalForce]
-                # update velocities and forceObjs[i]
-                velocities[i] = [
-                    veli + accelScalingFactor * a * newDt
-                    for veli, a in zip(velocities[i], accel)
-                ]
-                visualForce = [veci * forceScalingFactor for veci in force]
-                if showForces:
-                    forceVec.transform(visualForce[0], visualForce[1], visualForce[2])
+            # move masses based on their current velocities
+            dx = velocities * newDt
+            dx[static] = 0
+            if not allowZMovement:
+                dx[:, 2] = 0
+            positions += dx
+            frameDx += dx
+            # update velocities and visual forces with the forces from before the move
+            velocities += accelScalingFactor * accels * newDt
+            visualForces = forces * forceScalingFactor
+            # update the forces and the accelerations at the new positions
+            forces = _gravitationalForces(positions, masses, pairs)
+            accels = forces / masses[:, None]
             tcurr = tcurr + newDt
+        # a single pass over the balls moves each one and updates its force Vector
+        for i, (shift, visualForce) in enumerate(
+            zip(frameDx.tolist(), visualForces.tolist())
+        ):
+            if not static[i]:
+                ballList[i].shift(*shift)
+            if showForces:
+                forceVec = forceObjs[i]
+                if not static[i]:
+                    forceVec.shift(*shift)
+                forceVec.transform(visualForce[0], visualForce[1], visualForce[2])
         if render:
             f.r()
             if tcurr > nextBase:
@@ -1,8 +1,74 @@
 import numpy as np
-import sys
 from constants import EASE, CustomError, FRAME_RATE, PI,\
     BLACK, WHITE, MAKE_LIGHT, MAKE_DARK
 
+def _solve_cubic_01(a, b, c, d):
+    """
+    Solves a*t^3 + b*t^2 + c*t + d = 0 in closed form for the real root that lies in
+    [0, 1], for a whole array of constant coefficients d at once. Expects a Bezier
+    timing curve, i.e. a + b + c = 1 and -1 <= d <= 0.
+
+    Args:
+        a (float): cubic coefficient.
+        b (float): quadratic coefficient.
+        c (float): linear coefficient.
+        d (numpy.ndarray): constant coefficients, one per equation.
+
+    Returns:
+        numpy.ndarray: for each d, the root in [0, 1].
+    """
+    eps = 0.000001
+    d = np.asarray(d, dtype=np.float64)
+    if abs(a) < eps:
+        # the curve degenerates into a quadratic, or even a line
+        if abs(b) < eps:
+            roots = (-d / c)[None]
+        else:
+            sq = np.sqrt(np.maximum(c * c - 4 * b * d, 0))
+            roots = np.stack(((-c + sq) / (2 * b), (-c - sq) / (2 * b)))
+    else:
+        # depressed cubic x^3 + p*x + q = 0, where t = x - b / (3a)
+        shift = b / (3 * a)
+        p = (3 * a * c - b * b) / (3 * a * a)
+        q = (2 * b ** 3 - 9 * a * b * c + 27 * a * a * d) / (27 * a ** 3)
+        # one real root - Cardano's formula
+        sq = np.sqrt(np.maximum(q * q / 4 + p ** 3 / 27, 0))
+        roots = np.repeat([np.cbrt(-q / 2 + sq) + np.cbrt(-q / 2 - sq)], 3, axis=0)
+        # three real roots - trigonometric form
+        if p < 0:
+            # a double root (x1 == 0 or x2 == 1 puts one at an endpoint) makes the
+            # discriminant exactly 0, which roundoff can leave slightly positive, so
+            # measure it against the size of its terms
+            three = 4 * p ** 3 + 27 * q * q <= eps * (27 * q * q - 4 * p ** 3)
+            m = 2 * np.sqrt(-p / 3)
+            theta = np.arccos(np.clip(3 * q[three] / (p * m), -1, 1)) / 3
+            roots[:, three] = m * np.cos(
+                theta[None] - 2 * PI * np.arange(3)[:, None] / 3
+            )
+        roots -= shift
+    # pick the root closest to [0, 1] for each d
+    distances = np.abs(roots - np.clip(roots, 0, 1))
+    t = np.clip(roots[np.argmin(distances, axis=0), np.arange(d.size)], 0, 1)
+    # polish with a couple of Newton steps, falling back to bisection whenever a step
+    # would leave the bracket - the timing curve runs from 0 to 1, so [0, 1] brackets
+    # every root
+    lo = np.zeros_like(t)
+    hi = np.ones_like(t)
+    for _ in range(2):
+        f = ((a * t + b) * t + c) * t + d
+        lo = np.where(f < 0, t, lo)
+        hi = np.where(f > 0, t, hi)
+        slope = (3 * a * t + 2 * b) * t + c
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = t - f / slope
+        inside = (newton >= lo) & (newton <= hi)
+        t = np.where(f == 0, t, np.where(inside, newton, (lo + hi) / 2))
+    # a double root at either end can't be resolved past sqrt(eps), but X(0) = 0 and
+    # X(1) = 1 exactly
+    t[d == 0] = 0
+    t[d == -1] = 1
+    return t
+
 def cubic_bezier(tPoints=[0], inPoints=EASE):
     """
     Converts a list of floats (tPoints) into a new list that has those floats conform
@@ -29,41 +95,23 @@ def cubic_bezier(tPoints=[0], inPoints=EASE):
     # note: this expects tPoints to be linearly spaced
     a = 1 / (tPoints[-1] - tPoints[0])
     b = -tPoints[0] / (tPoints[-1] - tPoints[0])
-    mappedtPoints = [a * ti + b for ti in tPoints]
-    tNewMapped = []
-    for ti in mappedtPoints:
-        (x1, y1, x2, y2) = inPoints
-        """
-        basing algorithm off of:
-        https://stackoverflow.com/questions/8217346/cubic-bezier-curves-get-y-for-given-x
-        X(t) = (1-t)^3 * X0 + 3*(1-t)^2 * t * X1 + 3*(1-t) * t^2 * X2 + t^3 * X3
-        Y(t) = (1-t)^3 * Y0 + 3*(1-t)^2 * t * Y1 + 3*(1-t) * t^2 * Y2 + t^3 * Y3
-        """
-        # first, determine value of t for which X is equal to the input t
-        leRoots = np.roots([1 + 3 * x1 - 3 * x2, -6 * x1 + 3 * x2, 3 * x1, -ti])
-        timeRoots = []
-        eps = 0.000001
-        for root in leRoots:
-            if np.isreal(root) and root <= 1 + eps and root >= -eps:
-                timeRoots.append(root.real)
-        # error checking for none (due to roundoff error)
-        if len(timeRoots) == 0:
-            minVal = sys.maxsize
-            for root in leRoots:
-                if (
-                    root.real <= 1 + eps
-                    and root.real >= -eps
-                    and abs(root.imag) < minVal
-                ):
-                    minRoot = root
-                    minVal = abs(root.imag)
-            timeRoots.append(minRoot.real)
-        t1 = timeRoots[0]
-        tNewMapped.append(
-            3 * (1 - t1) ** 2 * t1 * y1 + 3 * (1 - t1) * t1 ** 2 * y2 + t1 ** 3
-        )
+    mappedtPoints = a * np.asarray(tPoints, dtype=np.float64) + b
+    # the ends map to exactly 0 and 1 - roundoff there would be blown up by a rate
+    # whose timing curve is flat at that end
+    mappedtPoints[0] = 0
+    mappedtPoints[-1] = 1
+    (x1, y1, x2, y2) = inPoints
+    """
+    basing algorithm off of:
+    https://stackoverflow.com/questions/8217346/cubic-bezier-curves-get-y-for-given-x
+    X(t) = (1-t)^3 * X0 + 3*(1-t)^2 * t * X1 + 3*(1-t) * t^2 * X2 + t^3 * X3
+    Y(t) = (1-t)^3 * Y0 + 3*(1-t)^2 * t * Y1 + 3*(1-t) * t^2 * Y2 + t^3 * Y3
+    """
+    # first, determine values of t for which X is equal to each input t
+    t1 = _solve_cubic_01(1 + 3 * x1 - 3 * x2, -6 * x1 + 3 * x2, 3 * x1, -mappedtPoints)
+    tNewMapped = 3 * (1 - t1) ** 2 * t1 * y1 + 3 * (1 - t1) * t1 ** 2 * y2 + t1 ** 3
     # undo t mapping
-    return [(ti - b) / a for ti in tNewMapped]
+    return ((tNewMapped - b) / a).tolist()
 
 def interpolate(xi=0, xf=1, rate=EASE, numIntervals=-1):
     """Interpolates between xi and xf with a Bezier-curve based rate.
@@ -192,11 +240,11 @@ def getInterpolatedColors(ti=0, tf=1, colori=BLACK, colorf=WHITE, rate=EASE):
     # determine the time values
     tAdj = interpolate(ti, tf, rate)
     tAdj.pop(0)
-    colorR = interpolate(colori[0], colorf[0], rate, len(tAdj))
-    colorR.pop(0)
-    colorG = interpolate(colori[1], colorf[1], rate, len(tAdj))
-    colorG.pop(0)
-    colorB = interpolate(colori[2], colorf[2], rate, len(tAdj))
-    colorB.pop(0)
-    colors = [(tAdj[i], (colorR[i], colorG[i], colorB[i], 1)) for i in range(len(tAdj))]
+    # every channel covers the same eased fraction of the way from colori to colorf,
+    # so interpolate that once and apply it to R, G and B together
+    fractions = interpolate(0, 1, rate, len(tAdj))[1:]
+    colorRGB = np.asarray(colori[:3], dtype=np.float64) + np.outer(
+        fractions, np.subtract(colorf[:3], colori[:3])
+    )
+    colors = [(t, (r, g, b, 1)) for t, (r, g, b) in zip(tAdj, colorRGB.tolist())]
     return colors
\ No newline at end of file
@@ -1,8 +1,15 @@
+import bpy
 import mathutils as mut
 import os
 from constants import C, D, CustomError, EXT_DIR, WHITE_GRAY
 from externals.iterable_utils import flatten
 
+# cached context overrides for operators that need a 3D viewport, keyed by window
+_OVERRIDE_CACHE = {}
+# svg filepath -> [(object name, pristine curve data name, matrix_world)] for each
+# curve of an imported SVG
+_SVG_IMPORT_CACHE = {}
+
 def selectOnly(strList=[], all=False):
     """Selects only the objects in the UI with names in strList
 
@@ -29,6 +36,28 @@ def selectOnly(strList=[], all=False):
         for obj in D.objects:
             obj.select_set(True)
 
+def selectionOverride(strList=[]):
+    """
+    Returns a context override in which only the objects with names in strList are
+    selected, with the first one active. Operators that work on the selected objects
+    (e.g. origin_set) can take it instead of changing the selection in the UI one
+    object at a time. Note that transform operators still go by the UI selection.
+
+    Args:
+        strList (list, optional): list of Blender objects to select. Defaults to [].
+
+    Returns:
+        dict: context override with the given objects selected.
+    """
+    objs = [D.objects[name] for name in strList]
+    override = C.copy()
+    override["selected_objects"] = objs
+    override["selected_editable_objects"] = objs
+    if objs:
+        override["active_object"] = objs[0]
+        override["object"] = objs[0]
+    return override
+
 def computeQuaternion(v1, v2):
     """Computes the quaternion between two mathutils Vectors.
 
@@ -104,3 +133,77 @@ def changeBackgroundColor(color=WHITE_GRAY):
     """
     C.scene.world.node_tree.nodes["Background"].inputs["Color"].default_value = color
     return True
+
+def viewOverride():
+    """
+    Returns a context override for operators that need to run within the 3D
+    viewport (e.g. loopcut_slide). The override is built once per window and reused
+    for as long as its area still lives on the window's screen.
+
+    Returns:
+        dict: context override with window, screen, area, region and scene.
+    """
+    win = C.window
+    scr = win.screen
+    override = _OVERRIDE_CACHE.get(id(win))
+    # rebuild if the screen changed or the cached area was removed
+    if (
+        override is None
+        or override["screen"] != scr
+        or override["area"] not in scr.areas[:]
+    ):
+        area = [area for area in scr.areas if area.type == "VIEW_3D"][0]
+        region = [region for region in area.regions if region.type == "WINDOW"][0]
+        override = {
+            "window": win,
+            "screen": scr,
+            "area": area,
+            "region": region,
+        }
+        _OVERRIDE_CACHE[id(win)] = override
+    override["scene"] = C.scene
+    return override
+
+def importSVG(filepath):
+    """
+    Imports an SVG file into the scene as curve objects. The first import of a file
+    keeps an untouched copy of each curve's data, so that later imports of the same
+    file copy that data instead of re-parsing the file. The data is copied rather
+    than shared, since resizing, origin setting and coloring all change the data of
+    each object.
+
+    Args:
+        filepath (str): full path of the SVG file.
+
+    Returns:
+        list: names of the newly added curve objects.
+    """
+    cached = _SVG_IMPORT_CACHE.get(filepath)
+    # the cached curves disappear if the blend file is reloaded
+    if cached and all(D.curves.get(dataName) for _, dataName, _ in cached):
+        newNames = []
+        for objName, dataName, matrix in cached:
+            obj = D.objects.new(objName, D.curves[dataName].copy())
+            obj.matrix_world = matrix
+            C.scene.collection.objects.link(obj)
+            newNames.append(obj.name)
+        return newNames
+    # the svg importer links its curves into a new collection at the end of the
+    # scene's children, so only that collection needs to be looked at
+    numChildren = len(C.scene.collection.children)
+    bpy.ops.import_curve.svg(filepath=filepath)
+    newNames = [
+        o.name
+        for coll in C.scene.collection.children[numChildren:]
+        for o in coll.objects
+    ]
+    # stash a fake-user copy of each curve, since resizing and origin setting
+    # change the imported data in place
+    cached = []
+    for name in newNames:
+        obj = D.objects[name]
+        pristine = obj.data.copy()
+        pristine.use_fake_user = True
+        cached.append((name, pristine.name, obj.matrix_world.copy()))
+    _SVG_IMPORT_CACHE[filepath] = cached
+    return newNames
@@ -1,7 +1,7 @@
 import mathutils as mut
 import numpy as np
 from collections import deque
-from constants import C, EASE_IN_OUT, ORIGIN, PI, CustomError, LINEAR
+from constants import C, EASE_IN_OUT, ORIGIN, PI, CustomError, LINEAR, DEG_TO_RAD
 from externals.blender_utils import computeQuaternion
 from externals.bezier_interpolation import interpolate
 from externals.iterable_utils import addition, mag
@@ -201,7 +201,7 @@ def camRotate(axis=ORIGIN, angle=0, angleDeg=False):
     if axis == ORIGIN:
         axis = cam.location
     if angleDeg:
-        angle = angle * PI / 180
+        angle = angle * DEG_TO_RAD
     # determine quaternion
     q = mut.Quaternion(axis, angle)
     # check for indeterminacy of q
@@ -1,5 +1,6 @@
 import collections
 import numpy as np
+from math import sqrt
 
 def mag(vec):
     """Determines the Euclidean norm of a vector in iterable form.
@@ -13,7 +14,7 @@ def mag(vec):
     leSum = 0
     for i in range(len(vec)):
         leSum += vec[i] ** 2
-    return np.sqrt(leSum)
+    return sqrt(leSum)
 
 def difference(v1, v2):
     """Returns the difference between two vectors in iterable form, i.e. v2 - v1.
@@ -198,3 +199,20 @@ def splitByMax(iterable):
         newIdx = sums.index(max(sums))
         currentSet.append(newIdx)
     return [iterable[i] for i in currentSet]
+
+def modeOrMean(values):
+    """
+    Returns the most common value in values, or their mean if no single value is the
+    most common. This is the same as trying statistics.mode() and falling back to
+    statistics.mean(), but counts everything in one pass.
+
+    Args:
+        values (iterable): some numbers.
+
+    Returns:
+        float: the mode of values if it's unique, otherwise the mean.
+    """
+    counts = collections.Counter(values).most_common(2)
+    if len(counts) == 1 or counts[0][1] > counts[1][1]:
+        return counts[0][0]
+    return sum(values) / len(values)
@@ -1,6 +1,7 @@
 import numpy as np
 import time
 from collections import deque
+from math import sqrt
 from pprint import pprint
 from traceback import format_stack
 from constants import WHITE, BLACK, GOLDEN_ANGLE
@@ -128,7 +129,7 @@ def cartesianToSpherical(x=0, y=0, z=0):
     Returns:
         tuple: tuple of Spherical coordinates.
     """
-    r = np.sqrt(x ** 2 + y ** 2 + z ** 2)
+    r = sqrt(x ** 2 + y ** 2 + z ** 2)
     return (r, np.arctan2(y, x), np.arccos(np.clip(z / r, -1, 1)))
 
 def computeRelativeNodes(nodes=[]):
@@ -246,3 +247,33 @@ def sphericallyEquidistantPoints(radius=1, numPoints=100):
             radius * np.sin(lat),
         )
     return points
+
+
+def resamplePath(origin=(0, 0, 0), nodes=[], numFrames=1):
+    """
+    Walks a polyline path at a constant speed and returns the per-frame shifts that
+    take you from the origin to the last node. Repeated nodes are skipped, and since
+    samples are interpolated along the path, a frame never overshoots a node.
+
+    Args:
+        origin (tuple, optional): starting point of the path. Defaults to (0, 0, 0).
+        nodes (list, optional): list of nodes (3-tuples) that the path goes through.
+            Defaults to [].
+        numFrames (int, optional): number of frames to split the path into.
+            Defaults to 1.
+
+    Returns:
+        numpy.ndarray: (numFrames, 3) array of shifts, one row per frame.
+    """
+    # lay the path out by cumulative distance, skipping repeated nodes
+    points = np.array([origin] + list(nodes), dtype=np.float64)
+    segLengths = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    keep = np.concatenate(([True], segLengths > 0))
+    points = points[keep]
+    cumDistance = np.concatenate(([0], np.cumsum(segLengths[keep[1:]])))
+    # sample the path at an equal distance per frame
+    frameDistances = np.linspace(0, cumDistance[-1], numFrames + 1)
+    framePoints = np.column_stack(
+        [np.interp(frameDistances, cumDistance, points[:, i]) for i in range(3)]
+    )
+    return np.diff(framePoints, axis=0)
\ No newline at end of file
@@ -0,0 +1,20 @@
+import os
+import sys
+import types
+
+# peeps modules import each other by their top-level names, as they do in Blender
+PEEPS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "peeps")
+if PEEPS_DIR not in sys.path:
+    sys.path.insert(0, PEEPS_DIR)
+
+# outside Blender, stand in for bpy and mathutils so constants and the externals
+# package import - the modules under test only use plain tuples and numpy
+if "bpy" not in sys.modules:
+    bpy = types.ModuleType("bpy")
+    bpy.context = types.SimpleNamespace(
+        scene=types.SimpleNamespace(eevee=types.SimpleNamespace())
+    )
+    bpy.data = types.SimpleNamespace()
+    sys.modules["bpy"] = bpy
+if "mathutils" not in sys.modules:
+    sys.modules["mathutils"] = types.ModuleType("mathutils")
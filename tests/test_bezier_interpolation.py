@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from constants import EASE, EASE_IN, EASE_IN_OUT, EASE_OUT, LINEAR, MAKE_DARK,\
+    MAKE_LIGHT
+from externals.bezier_interpolation import _solve_cubic_01, cubic_bezier, interpolate
+
+# x1 == 0 or x2 == 1 puts a double root of the timing cubic at an endpoint, which
+# the closed-form solver used to get wrong
+BOUNDARY_RATES = [
+    (0, 0, 0.58, 1),
+    (0, 0.5, 0.9, 0.5),
+    (0.42, 0, 1, 1),
+    (0.1, 1, 1, 0),
+    (0, 0, 1, 1),
+    (0, 1, 1, 0),
+]
+RATES = [LINEAR, EASE, EASE_IN, EASE_IN_OUT, EASE_OUT, MAKE_LIGHT, MAKE_DARK]
+
+def np_roots_cubic_bezier(tPoints, rate):
+    # the per-sample np.roots solve that cubic_bezier used before it was vectorized
+    x1, y1, x2, y2 = rate
+    a = 1 / (tPoints[-1] - tPoints[0])
+    b = -tPoints[0] / (tPoints[-1] - tPoints[0])
+    values = []
+    for ti in tPoints:
+        roots = np.roots([1 + 3 * x1 - 3 * x2, -6 * x1 + 3 * x2, 3 * x1, -(a * ti + b)])
+        inside = [r for r in roots if -1e-6 <= r.real <= 1 + 1e-6]
+        real = [r.real for r in inside if np.isreal(r)]
+        t1 = real[0] if real else min(inside, key=lambda r: abs(r.imag)).real
+        tNew = 3 * (1 - t1) ** 2 * t1 * y1 + 3 * (1 - t1) * t1 ** 2 * y2 + t1 ** 3
+        values.append((tNew - b) / a)
+    return values
+
+@pytest.mark.parametrize("rate", RATES)
+def test_cubic_bezier_matches_np_roots(rate):
+    tPoints = np.linspace(2, 5, 3 * 60 + 1)
+    np.testing.assert_allclose(
+        cubic_bezier(tPoints, rate), np_roots_cubic_bezier(tPoints, rate), atol=1e-9
+    )
+
+@pytest.mark.parametrize("rate", RATES + BOUNDARY_RATES)
+def test_interpolate_hits_endpoints_and_stays_in_range(rate):
+    values = interpolate(0, 1, rate)
+    assert values[0] == pytest.approx(0, abs=1e-12)
+    assert values[-1] == pytest.approx(1, abs=1e-12)
+    assert all(-1e-12 <= value <= 1 + 1e-12 for value in values)
+
+@pytest.mark.parametrize("rate", RATES + BOUNDARY_RATES)
+def test_interpolate_maps_onto_any_interval(rate):
+    values = interpolate(2, 5, rate, 30)
+    assert len(values) == 31
+    assert values[0] == pytest.approx(2, abs=1e-12)
+    assert values[-1] == pytest.approx(5, abs=1e-12)
+    assert all(2 - 1e-12 <= value <= 5 + 1e-12 for value in values)
+
+@pytest.mark.parametrize("rate", RATES + BOUNDARY_RATES)
+def test_solve_cubic_01_solves_every_sample(rate):
+    x1, _, x2, _ = rate
+    a, b, c = 1 + 3 * x1 - 3 * x2, -6 * x1 + 3 * x2, 3 * x1
+    x = np.linspace(0, 1, 241)
+    t = _solve_cubic_01(a, b, c, -x)
+    assert t[0] == 0 and t[-1] == 1
+    assert np.all((t >= 0) & (t <= 1))
+    # a root next to a double root is only pinned down to about sqrt(eps), so check
+    # X(t) against x rather than t itself
+    np.testing.assert_allclose(((a * t + b) * t + c) * t, x, rtol=0, atol=1e-12)